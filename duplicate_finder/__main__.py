@@ -21,7 +21,13 @@ def main() -> None:
         sort_by_group_size=args.sort_by_group_size,
         sort_by_file_size=args.sort_by_file_size,
         threads_count=args.threads,
+        use_processes=args.processes,
+        prefilter_bytes=args.prefilter_bytes,
+        read_block_size=args.read_block_size,
         verify_content=args.verify_content,
+        fast_hash=args.fast,
+        hash_algo=args.hash_algo,
+        hash_cache_path=args.hash_cache,
         delete_duplicates=args.delete,
         delete_report_file_path=args.delete_report,
         interactive_mode=args.interactive,
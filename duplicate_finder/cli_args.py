@@ -4,6 +4,8 @@
 
 import argparse
 
+from duplicate_finder.utils import HASH_ALGORITHMS
+
 
 class ArgumentParserAdapter:
     def __init__(self) -> None:
@@ -99,12 +101,18 @@ class ArgumentParserAdapter:
         )
 
         self.parser.add_argument(
-            "--threads", "-j",
+            "--threads", "--jobs", "-j",
             type=int,
             default=None,
             help="Optional: Number of threads. Dynamically adjusted by default",
         )
 
+        self.parser.add_argument(
+            "--processes", "-p",
+            action="store_true",
+            help="Optional: Hash files in worker processes instead of threads",
+        )
+
         self.parser.add_argument(
             "--min-size", "-m",
             type=str,
@@ -121,6 +129,22 @@ class ArgumentParserAdapter:
             " duplicate detection (e.g. 100K, 5M, 1G)",
         )
 
+        self.parser.add_argument(
+            "--prefilter-bytes", "-b",
+            type=int,
+            default=None,
+            help="Optional: Number of bytes compared at the start and at the"
+            " end of files\nbefore they are hashed in full (4096 by default)",
+        )
+
+        self.parser.add_argument(
+            "--read-block-size",
+            type=int,
+            default=None,
+            help="Optional: Size of the blocks files are read in while"
+            " hashing,\nin bytes (1 MiB by default)",
+        )
+
         self.parser.add_argument(
             "--verify-content", "-v",
             action="store_true",
@@ -128,6 +152,30 @@ class ArgumentParserAdapter:
             " they are identical (default is to compare file sizes only)",
         )
 
+        self.parser.add_argument(
+            "--fast", "-f",
+            action="store_true",
+            help="Optional: Use a fast non-cryptographic hash (XXH3 if"
+            " xxhash is installed)\nand verify matches byte by byte",
+        )
+
+        self.parser.add_argument(
+            "--hash-algo", "-a",
+            type=str,
+            default="auto",
+            choices=HASH_ALGORITHMS,
+            help="Optional: hash algorithm used to compare files."
+            " 'auto' picks BLAKE3\nif installed and SHA256 otherwise",
+        )
+
+        self.parser.add_argument(
+            "--hash-cache", "-c",
+            type=str,
+            default=None,
+            help="Optional: path to a database file where file hashes are"
+            " cached\nbetween runs, so unchanged files are not hashed again",
+        )
+
     def parse(self) -> argparse.Namespace:
         # Parse and return the command-line arguments
         return self.parser.parse_args()
@@ -2,21 +2,79 @@
 # Licensed under the MIT License.
 # See LICENSE file in the project root for full license text.
 
-import fnmatch
-import sys
+import math
+import os
+import sqlite3
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Callable, Iterator
+from concurrent.futures import (FIRST_COMPLETED, Executor, Future,
+                                ProcessPoolExecutor, ThreadPoolExecutor,
+                                as_completed, wait)
 from pathlib import Path
-from threading import Lock
 
 from duplicate_finder import utils
 from duplicate_finder.duplicate_finder_config import DuplicateFinderConfig
+from duplicate_finder.hash_cache import HashCache
+from duplicate_finder.progress import Progress
+
+# Device, inode and modification time (ns) of a regular file, taken
+# from the scan: identifies a file and the version of its content
+_FileId = tuple[int, int, int]
+
+# Result of a single directory scan: subdirectories with their (device,
+# inode) pairs, (path, size, file id) of regular files and paths that
+# could not be accessed
+_ScanResult = tuple[
+    list[tuple[str, tuple[int, int]]],
+    list[tuple[str, int, _FileId]],
+    list[tuple[str, OSError]]
+]
+
+# Files up to this size are grouped by their content, not hashed
+_TINY_FILE_SIZE = 64
+
+# Amount of data to hash that justifies one more hashing worker
+_HASH_BYTES_PER_WORKER = 8 << 20
+
+# Write buffer of report files, large reports are flushed in few calls
+_REPORT_BUFFER_SIZE = 1 << 20
+
+
+def _hash_files(paths: list[str],
+                algorithm: str = "auto",
+                block_size: int = utils.READ_BLOCK_SIZE
+                ) -> list[tuple[str, bytes | Exception]]:
+    # Hash a batch of files in one task. Module-level, so it can be
+    # pickled and run in a worker process, which then pays the IPC
+    # round trip once per batch. Errors are returned per file, so one
+    # unreadable file does not fail the whole batch
+    results: list[tuple[str, bytes | Exception]] = []
+    for path in paths:
+        try:
+            results.append(
+                (path, utils.calc_file_digest(path, algorithm, block_size)))
+        except Exception as e:
+            results.append((path, e))
+    return results
+
+
+def _lower_worker_priority() -> None:
+    # Keep hashing processes from starving interactive work
+    if hasattr(os, "nice"):
+        os.nice(5)
 
 
 class DuplicateFinder:
     def __init__(self) -> None:
         # Internal state for storing results
         self.duplicates: list[list[str]] = []
+        # Sizes of potential duplicates, captured during the scan
+        self.file_sizes: dict[str, int] = {}
+        # File ids of potential duplicates, captured during the scan
+        self.file_ids: dict[str, _FileId] = {}
+        # Digests computed by earlier runs of this finder, used when no
+        # persistent hash cache is configured
+        self._memory_cache: HashCache | None = None
 
     def run(
         self,
@@ -27,45 +85,122 @@ class DuplicateFinder:
 
         self.cfg = config
 
-        # Stage 1: Scan the folder and find duplicates
-        print(f"Scanning folder: {self.cfg.scan_folder_path}")
-        files_by_size = self._get_files_list(
-            folder_path=self.cfg.scan_folder_path,
-            include_patterns=self.cfg.include_patterns,
-            exclude_patterns=self.cfg.exclude_patterns,
-            min_size=self.cfg.min_file_size,
-            max_size=self.cfg.max_file_size)
-        if not files_by_size:
-            print("No files found or all files are excluded.")
-            return self.duplicates
-
-        # Remove single files from the list, as they cannot be duplicates
-        grouped_files = self._remove_single_files_from_file_list(
-            files_list=files_by_size)
-        files_by_size.clear()
-        if not grouped_files:
-            print("No potential duplicates found after filtering by size.")
-            return self.duplicates
+        # Files are sampled in the background while the scan is still
+        # running, as soon as a second file of the same size is found.
+        # A single thread runs the stages one after another instead
+        pipelined = self.cfg.threads_count > 1
+        with ThreadPoolExecutor(
+                max_workers=self.cfg.threads_count) as sampler:
+            samples: dict[str, Future[bytes]] = {}
+
+            def sample_candidates(size: int, paths: list[str]) -> None:
+                # Called on the scanning thread only, no locking needed
+                if size > _TINY_FILE_SIZE:
+                    for path in paths:
+                        samples[path] = sampler.submit(
+                            utils.calc_file_sample_hash, path,
+                            self.cfg.prefilter_bytes)
+
+            # Stage 1: Scan the folder and find duplicates
+            print(f"Scanning folder: {self.cfg.scan_folder_path}")
+            files_by_size = self._get_files_list(
+                folder_path=self.cfg.scan_folder_path,
+                include_patterns=self.cfg.include_patterns,
+                exclude_patterns=self.cfg.exclude_patterns,
+                min_size=self.cfg.min_file_size,
+                max_size=self.cfg.max_file_size,
+                max_workers=self.cfg.threads_count,
+                on_candidates=sample_candidates if pipelined else None,
+                file_ids=self.file_ids)
+            if not files_by_size:
+                print("No files found or all files are excluded.")
+                return self.duplicates
+
+            # Remove single files from the list, as they cannot be
+            # duplicates
+            grouped_files = self._remove_single_files_from_file_list(
+                files_list=files_by_size)
+            files_by_size.clear()
+            if not grouped_files:
+                print("No potential duplicates found"
+                      " after filtering by size.")
+                return self.duplicates
+
+            # Keep sizes known from the scan, so reporting needs no stat(),
+            # and file ids of potential duplicates for hardlink detection
+            self.file_sizes = {
+                path: size for size, files in grouped_files.items()
+                for path in files
+            }
+            self.file_ids = {
+                path: self.file_ids[path] for path in self.file_sizes
+            }
 
-        # Stage 2: Hash files that have the same size
-        files_by_hash = self._group_files_by_hash(
-            files_by_size=grouped_files,
-            max_workers=self.cfg.threads_count)
-        grouped_files.clear()
+            # Empty and tiny files are grouped by their content directly,
+            # they are removed from the size groups and never hashed
+            files_by_hash = self._group_small_files(
+                files_by_size=grouped_files)
+
+            # Stage 2: Split groups by a cheap hash of the first and last
+            # blocks, so files that differ early or late are never fully
+            # read. Most samples are already in flight from the scan
+            files_by_sample = self._group_files_by_sample(
+                files_by_size=grouped_files,
+                max_workers=self.cfg.threads_count,
+                sample_size=self.cfg.prefilter_bytes,
+                samples=samples)
+            grouped_files.clear()
+
+        # Files not larger than two samples were read completely while
+        # sampling, so their sample hash is final and they skip hashing
+        for size, sample in list(files_by_sample):
+            if size <= 2 * self.cfg.prefilter_bytes:
+                files_by_hash[b"%d:%s" % (size, sample)] = (
+                    files_by_sample.pop((size, sample)))
+
+        # Stage 3: Hash files that have the same size and sample
+        hash_bytes = sum(
+            size * len(files)
+            for (size, _), files in files_by_sample.items()
+        )
+        cache = self._open_hash_cache(self.cfg.hash_cache_path,
+                                      self.cfg.hash_algo)
+        if cache is None:
+            cache = self._get_memory_cache(self.cfg.hash_algo)
+        try:
+            files_by_hash.update(self._group_files_by_hash(
+                file_groups=list(files_by_sample.values()),
+                max_workers=self._get_hash_workers_count(
+                    hash_bytes, self.cfg.threads_count),
+                algorithm=self.cfg.hash_algo,
+                block_size=self.cfg.read_block_size,
+                use_processes=self.cfg.use_processes,
+                file_sizes=self.file_sizes,
+                file_ids=self.file_ids,
+                cache=cache))
+        finally:
+            if cache is not self._memory_cache:
+                self._close_hash_cache(cache)
+        files_by_sample.clear()
         if not files_by_hash:
             print("No potential duplicates found after hashing.")
             return self.duplicates
 
-        # Stage 3: Sort duplicates and print them
-        # Verify duplicates by comparing file contents
-        if self.cfg.verify_content:
+        # Stage 4: Sort duplicates and print them
+        # Verify duplicates by comparing file contents. Fast fingerprints
+        # are not collision resistant, so they are always verified
+        if (self.cfg.verify_content or self.cfg.fast_hash
+                or self.cfg.hash_algo == "xxh3_128"):
             files_by_hash = (
-                self._verify_content(files_by_hash))
+                self._verify_content(
+                    files_by_hash,
+                    max_workers=self.cfg.threads_count))
 
         # Group files into duplicate groups
         self.duplicates = (
             self._group_duplicates(
                 files_by_hash,
+                self.file_sizes,
                 sort_by_group=self.cfg.sort_by_group_size,
                 sort_by_size=self.cfg.sort_by_file_size))
         # Clear file groups to free memory
@@ -75,19 +210,20 @@ class DuplicateFinder:
             return self.duplicates
 
         # Print found duplicates to console
-        self._print_duplicates(self.duplicates)
+        self._print_duplicates(self.duplicates, self.file_sizes)
 
         # Save duplicates to output report if requested
         if self.cfg.output_file_path:
             self._save_report_to_file(
-                self.duplicates, self.cfg.output_file_path)
+                self.duplicates, self.cfg.output_file_path, self.file_sizes)
 
-        # Stage 4: Handle deletion if requested
+        # Stage 5: Handle deletion if requested
         # Handle interactive or automatic deletion
         if self.cfg.interactive_mode:
             self._delete_duplicates_interactive(
                 duplicates=self.duplicates,
-                report_path=self.cfg.delete_report_file_path)
+                report_path=self.cfg.delete_report_file_path,
+                file_sizes=self.file_sizes)
         elif self.cfg.delete_duplicates:
             confirm = "y"
             if not self.cfg.dry_run:
@@ -103,7 +239,8 @@ class DuplicateFinder:
                 self._delete_duplicates(
                     self.duplicates,
                     dry_run=self.cfg.dry_run,
-                    report_path=self.cfg.delete_report_file_path)
+                    report_path=self.cfg.delete_report_file_path,
+                    file_sizes=self.file_sizes)
             else:
                 print("Deletion cancelled.")
 
@@ -112,6 +249,8 @@ class DuplicateFinder:
     def _clear_results(self) -> None:
         # Clear all previous results
         self.duplicates.clear()
+        self.file_sizes.clear()
+        self.file_ids.clear()
 
     @staticmethod
     def _get_files_list(
@@ -119,9 +258,16 @@ class DuplicateFinder:
         include_patterns: list[str] | None = None,
         exclude_patterns: list[str] | None = None,
         min_size: int | None = None,
-        max_size: int | None = None
+        max_size: int | None = None,
+        max_workers: int = 8,
+        on_candidates: Callable[[int, list[str]], None] | None = None,
+        file_ids: dict[str, _FileId] | None = None
     ) -> dict[int, list[str]]:
-        # Group all files by their size
+        # Group all files by their size. on_candidates is called with
+        # the size and the new paths every time a size group grows to
+        # two files or more, so later stages can start before the scan
+        # is finished. The ids of selected files are stored in file_ids,
+        # if given
         input_path = Path(folder_path).expanduser().resolve()
         if not input_path.is_dir():
             print(f"ERROR: Path '{input_path}'"
@@ -129,50 +275,122 @@ class DuplicateFinder:
             return {}
 
         print("Filtering files...")
-        files = defaultdict(list)
+        files: defaultdict[int, list[str]] = defaultdict(list)
         processed = 0
         selected = 0
-
-        for p in input_path.rglob("*"):
-            try:
-                if p.is_file() and not p.is_symlink():
-                    processed += 1
-                    print(f"\r[Size Scan] Progress [{processed}]",
-                          end="")
-
-                    # Check file size
-                    size = p.stat().st_size
-                    if min_size and size < min_size:
-                        continue
-                    if max_size and size > max_size:
-                        continue
-
-                    # Check include patterns
-                    if include_patterns:
-                        if not any(
-                            fnmatch.fnmatch(p.as_posix(), pattern)
-                            for pattern in include_patterns
-                        ):
-                            continue
-
-                    # Check exclude patterns from included files
-                    if exclude_patterns:
-                        if any(
-                            fnmatch.fnmatch(p.as_posix(), pattern)
-                            for pattern in exclude_patterns
-                        ):
+        progress = Progress("Size Scan")
+
+        # Every pattern list is compiled once into a single matcher
+        include = utils.compile_matcher(include_patterns)
+        exclude = utils.compile_matcher(exclude_patterns)
+        match_patterns = include is not None or exclude is not None
+
+        # Missing (or zero) limits do not filter anything, so both
+        # bounds are checked with one chained comparison per file
+        lowest = min_size or 0
+        highest = max_size or math.inf
+
+        # A directory reachable by several paths (bind mounts) is only
+        # scanned once, otherwise its files would be reported as their
+        # own duplicates and deleting one would delete the other as well
+        root_stat = input_path.stat()
+        seen_dirs = {(root_stat.st_dev, root_stat.st_ino)}
+
+        # Parallel traversal by using threads: every directory is scanned
+        # by a separate task, so many stat() calls are in flight at once
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending: set[Future[_ScanResult]] = {
+                executor.submit(DuplicateFinder._scan_directory,
+                                str(input_path))
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subdirs, entries, errors = future.result()
+                    for subdir, key in subdirs:
+                        # File systems without inode numbers report 0
+                        if key[1]:
+                            if key in seen_dirs:
+                                continue
+                            seen_dirs.add(key)
+                        pending.add(executor.submit(
+                            DuplicateFinder._scan_directory, subdir))
+
+                    for path, error in errors:
+                        print(f"\nATTENTION: Skipping {path}"
+                              f" due to access error: {error}")
+
+                    processed += len(entries)
+                    progress.tick(processed)
+
+                    for path, size, file_id in entries:
+                        # Check file size
+                        if not lowest <= size <= highest:
                             continue
 
-                    files[size].append(str(p))
-                    selected += 1
-            except (OSError, PermissionError) as e:
-                print(f"\nATTENTION: Skipping {p} due to access error: {e}")
-
-        print(f"\nScanning finished. Selected {selected}"
+                        # Patterns are matched against POSIX-style paths,
+                        # the path is only converted if there are any
+                        if match_patterns:
+                            posix_path = (path if os.sep == "/"
+                                          else path.replace(os.sep, "/"))
+
+                            # Check include patterns
+                            if include and not include(posix_path):
+                                continue
+
+                            # Check exclude patterns from included files
+                            if exclude and exclude(posix_path):
+                                continue
+
+                        group = files[size]
+                        group.append(path)
+                        selected += 1
+                        if file_ids is not None:
+                            file_ids[path] = file_id
+                        if on_candidates is not None and len(group) > 1:
+                            on_candidates(size, group if len(group) == 2
+                                          else group[-1:])
+
+        progress.finish()
+        print(f"Scanning finished. Selected {selected}"
               f" files from {processed}.")
         print(f"Found {len(files)} unique file sizes.")
         return files
 
+    @staticmethod
+    def _scan_directory(directory: str) -> _ScanResult:
+        # List a single directory: return its subdirectories, regular
+        # files with their sizes and entries that could not be accessed.
+        # Symlinks are neither a directory nor a file without following
+        # them, so they are skipped. DirEntry caches the file type on
+        # most platforms, so no extra syscalls are made to detect them:
+        # the only call per regular file is the lstat() for its size
+        # and id, which Windows even answers from the directory listing
+        # (without the inode number). Subdirectories are stat'ed for
+        # their device and inode as well, so directories reachable by
+        # several paths are detected.
+        subdirs: list[tuple[str, tuple[int, int]]] = []
+        entries: list[tuple[str, int, _FileId]] = []
+        errors: list[tuple[str, OSError]] = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            subdirs.append(
+                                (entry.path, (st.st_dev, st.st_ino)))
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            entries.append((entry.path, st.st_size,
+                                            (st.st_dev, st.st_ino,
+                                             st.st_mtime_ns)))
+                    except OSError as e:
+                        errors.append((entry.path, e))
+        except OSError as e:
+            errors.append((directory, e))
+        return subdirs, entries, errors
+
     @staticmethod
     def _remove_single_files_from_file_list(
         files_list: dict[int, list[str]],
@@ -182,80 +400,293 @@ class DuplicateFinder:
             print("No files found, skipping duplicate search.")
             return {}
 
-        result = {}
+        # A single comprehension keeps the whole pass in C, grouping is
+        # too fast to need a progress indicator
         print("Grouping files by size...")
-        for i, (size, files) in enumerate(files_list.items(), 1):
-            if len(files) > 1:
-                result[size] = files
-            print(f"\r[Grouping] Progress [{i}/{len(files_list)}]",
-                  end="",
-                  file=sys.stdout,
-                  flush=True)
-        print()
+        result = {
+            size: files for size, files in files_list.items()
+            if len(files) > 1
+        }
         print(f"Found {len(result)} potential duplicate groups ")
         return result
 
     @staticmethod
-    def _group_files_by_hash(files_by_size: dict[int, list[str]],
-                             max_workers: int = 8) -> dict[str, list[str]]:
+    def _group_small_files(
+        files_by_size: dict[int, list[str]],
+        max_size: int = _TINY_FILE_SIZE
+    ) -> dict[bytes, list[str]]:
+        # Group files up to max_size bytes by their raw content and remove
+        # them from files_by_size. Reading such a file costs less than
+        # hashing it, and all empty files are identical without any read.
+        # Keys start with the size and a ':', so they cannot be mistaken
+        # for the digest of a file of another size
+        small_files = defaultdict(list)
+        for size in [s for s in files_by_size if s <= max_size]:
+            for path in files_by_size.pop(size):
+                if size == 0:
+                    small_files[b"0:"].append(path)
+                    continue
+                try:
+                    # Unbuffered, a single read() without a buffer object
+                    with open(path, "rb", buffering=0) as f:
+                        content = f.read()
+                    small_files[b"%d:%s" % (size, content)].append(path)
+                except OSError as e:
+                    print(f"\nERROR: Failed to read {path}: {e}")
+
+        return {
+            key: files for key, files in small_files.items()
+            if len(files) > 1
+        }
+
+    @staticmethod
+    def _group_files_by_sample(
+        files_by_size: dict[int, list[str]],
+        max_workers: int = 8,
+        sample_size: int = utils.SAMPLE_SIZE,
+        samples: dict[str, Future[bytes]] | None = None
+    ) -> dict[tuple[int, bytes], list[str]]:
         if not files_by_size:
-            print("No files to hash, skipping hashing step.")
+            print("No files to sample, skipping sampling step.")
             return {}
 
-        # Calculate hash for files that have the same size
-        print("Hashing potential duplicates...")
+        # Calculate a hash of the head and tail blocks of every file
+        print("Sampling potential duplicates...")
 
-        files_to_hash = [
-            path for files in files_by_size.values() for path in files
+        files_to_sample = [
+            (size, path) for size, files in files_by_size.items()
+            for path in files
         ]
-        total = len(files_to_hash)
-
-        files_by_hash = defaultdict(list)
-        lock = Lock()
+        total = len(files_to_sample)
 
-        def hash_worker(path: str) -> tuple[str, str]:
-            return path, utils.calc_file_sha256(path)
+        files_by_sample = defaultdict(list)
+        progress = Progress("Sampling", total)
 
-        # Parallel hashing by using threads
+        # Parallel sampling by using threads. Samples that were started
+        # during the scan are reused, the rest are submitted here
+        samples = samples or {}
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_path = {
-                executor.submit(hash_worker,
-                                path): path for path in files_to_hash
+            future_to_file = {
+                samples.get(path) or executor.submit(
+                    utils.calc_file_sample_hash, path,
+                    sample_size): (size, path)
+                for size, path in files_to_sample
             }
-            for i, future in enumerate(as_completed(future_to_path), 1):
-                print(f"\r[Hashing] Progress [{i}/{total}]",
-                      end="",
-                      file=sys.stdout,
-                      flush=True)
+            for i, future in enumerate(as_completed(future_to_file), 1):
+                progress.tick(i)
+                size, path = future_to_file[future]
                 try:
-                    path, file_hash = future.result()
-                    if file_hash:
-                        with lock:
-                            files_by_hash[file_hash].append(path)
+                    files_by_sample[(size, future.result())].append(path)
                 except Exception as e:
-                    print(f"\nERROR: Failed to hash" f""
-                          f" {future_to_path[future]}: {e}")
-        print()
+                    print(f"\nERROR: Failed to sample {path}: {e}")
+        progress.finish()
+
+        # Files with a unique sample cannot have duplicates
+        result = {
+            key: files for key, files in files_by_sample.items()
+            if len(files) > 1
+        }
+        print(f"Found {len(result)} potential duplicate groups"
+              f" after sampling")
+        return result
+
+    @staticmethod
+    def _get_hash_workers_count(total_bytes: int, max_workers: int) -> int:
+        # Scale the number of hashing workers with the amount of data:
+        # a handful of small files is hashed faster by a single thread
+        # than by a pool that has to be spun up, while large batches use
+        # up to max_workers
+        return max(1, min(max_workers,
+                          total_bytes // _HASH_BYTES_PER_WORKER))
+
+    @staticmethod
+    def _group_files_by_hash(file_groups: list[list[str]],
+                             max_workers: int = 8,
+                             algorithm: str = "auto",
+                             block_size: int = utils.READ_BLOCK_SIZE,
+                             use_processes: bool = False,
+                             file_sizes: dict[str, int] | None = None,
+                             file_ids: dict[str, _FileId] | None = None,
+                             cache: HashCache | None = None
+                             ) -> dict[bytes, list[str]]:
+        if not file_groups:
+            print("No files to hash, skipping hashing step.")
+            return {}
+
+        # Calculate hash for files that have the same size and sample
+        print("Hashing potential duplicates...")
+
+        # Hardlinks share their content, so only one path per inode is
+        # hashed and its links join the same group afterwards. Groups
+        # of links to a single file are not hashed at all
+        files_to_hash, links, linked = DuplicateFinder._collapse_hardlinks(
+            file_groups, file_ids)
+
+        # Files hashed by an earlier run and unchanged since then are
+        # taken from the cache and not read again. The cache is checked
+        # against the state seen by the scan, so no file is stat'ed
+        # again. Directory listings on Windows carry no inode numbers,
+        # those files are stat'ed by the cache itself
+        files_by_hash = defaultdict(list, linked)
+        if cache is not None:
+            uncached = []
+            for path in files_to_hash:
+                file_id = file_ids.get(path) if file_ids else None
+                size = file_sizes.get(path) if file_sizes else None
+                state = None
+                if file_id is not None and file_id[1] and size is not None:
+                    state = (*file_id, size)
+                cached = cache.get(path, state)
+                if cached is None:
+                    uncached.append(path)
+                else:
+                    files_by_hash[cached].append(path)
+                    files_by_hash[cached].extend(links.get(path, ()))
+            files_to_hash = uncached
+        total = len(files_to_hash)
+
+        # Largest files first: a big file submitted last would keep a
+        # single worker busy long after all the others are done
+        if file_sizes:
+            files_to_hash.sort(key=file_sizes.__getitem__, reverse=True)
+
+        progress = Progress("Hashing", total)
+
+        # Parallel hashing by using threads, or processes to keep
+        # CPU-bound hashing off the GIL entirely. Threads get one file
+        # per task, processes get batches (about 4 per worker) to
+        # amortize the IPC cost
+        executor: Executor
+        batch_size = 1
+        if use_processes:
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_lower_worker_priority)
+            batch_size = max(1, total // (max_workers * 4))
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        with executor:
+            futures = [
+                executor.submit(_hash_files,
+                                files_to_hash[i:i + batch_size],
+                                algorithm, block_size)
+                for i in range(0, total, batch_size)
+            ]
+            completed = 0
+            for future in as_completed(futures):
+                for path, file_hash in future.result():
+                    completed += 1
+                    progress.tick(completed)
+                    # Results are collected on this thread only,
+                    # no locking is needed
+                    if isinstance(file_hash, Exception):
+                        print(f"\nERROR: Failed to hash {path}: {file_hash}")
+                    elif file_hash:
+                        files_by_hash[file_hash].append(path)
+                        files_by_hash[file_hash].extend(links.get(path, ()))
+                        if cache is not None:
+                            cache.put(path, file_hash)
+        # Files that failed to hash stay missed, the cache would keep
+        # them until it is closed
+        if cache is not None:
+            cache.discard_misses()
+        progress.finish()
         return files_by_hash
 
     @staticmethod
-    def _group_duplicates(files: dict[str, list[str]],
+    def _open_hash_cache(cache_path: str | None,
+                         algorithm: str) -> HashCache | None:
+        # Open the persistent hash cache, if one is configured. A broken
+        # cache only costs speed, so the search goes on without it
+        if not cache_path:
+            return None
+        try:
+            return HashCache(cache_path, algorithm)
+        except sqlite3.Error as e:
+            print(f"\nERROR: Failed to open hash cache {cache_path}: {e}")
+            return None
+
+    def _get_memory_cache(self, algorithm: str) -> HashCache:
+        # Keep digests in memory between runs of this finder, so files
+        # unchanged since the previous run are not hashed again
+        if (self._memory_cache is None
+                or self._memory_cache.algorithm != algorithm):
+            self._memory_cache = HashCache(None, algorithm)
+        return self._memory_cache
+
+    @staticmethod
+    def _close_hash_cache(cache: HashCache) -> None:
+        # Save new digests to the hash cache and close it
+        try:
+            cache.close()
+        except sqlite3.Error as e:
+            print(f"\nERROR: Failed to save hash cache: {e}")
+
+    @staticmethod
+    def _collapse_hardlinks(
+        file_groups: list[list[str]],
+        file_ids: dict[str, _FileId] | None = None
+    ) -> tuple[list[str], dict[str, list[str]], dict[bytes, list[str]]]:
+        # Pick one path per (device, inode) in every group. Returns the
+        # paths to hash, the other links of each picked path and the
+        # groups made of links to a single file, which are duplicates
+        # without hashing. The pairs are taken from file_ids, recorded
+        # by the scan, and files missing there or recorded without an
+        # inode number are stat'ed. Files that cannot be stat'ed, or
+        # have no inode number even then, are kept as they are
+        files: list[str] = []
+        links: defaultdict[str, list[str]] = defaultdict(list)
+        linked: dict[bytes, list[str]] = {}
+        for group in file_groups:
+            by_inode: dict[tuple[int, int], str] = {}
+            group_files: list[str] = []
+            for path in group:
+                file_id = file_ids.get(path) if file_ids else None
+                key = file_id[:2] if file_id else None
+                # Directory listings on Windows carry no inode numbers
+                if key is None or not key[1]:
+                    try:
+                        st = os.stat(path, follow_symlinks=False)
+                    except OSError:
+                        group_files.append(path)
+                        continue
+                    key = (st.st_dev, st.st_ino)
+                if key[1] and key in by_inode:
+                    links[by_inode[key]].append(path)
+                else:
+                    by_inode[key] = path
+                    group_files.append(path)
+            if len(group_files) == 1 and group_files[0] in links:
+                path = group_files[0]
+                dev, ino = next(iter(by_inode))
+                linked[b"inode:%d:%d" % (dev, ino)] = [
+                    path, *links.pop(path)]
+            else:
+                files.extend(group_files)
+        return files, links, linked
+
+    @staticmethod
+    def _group_duplicates(files: dict[bytes, list[str]],
+                          file_sizes: dict[str, int],
                           sort_by_group: bool = False,
                           sort_by_size: bool = False
                           ) -> list[list[str]]:
-        groups = [
-            sorted(group) for group
-            in files.values()
-            if len(group) > 1
-        ]
+        # Groups are sorted in place, without copying them: paths within
+        # a group stay in a deterministic order, as deletion keeps the
+        # first file of every group
+        groups = [group for group in files.values() if len(group) > 1]
+        for group in groups:
+            group.sort()
         if sort_by_group:
             groups.sort(key=len, reverse=True)
         elif sort_by_size:
-            groups.sort(key=lambda g: Path(g[0]).stat().st_size, reverse=True)
+            groups.sort(key=lambda g: file_sizes[g[0]], reverse=True)
         return groups
 
     @staticmethod
-    def _print_duplicates(duplicates: list[list[str]]) -> None:
+    def _print_duplicates(duplicates: list[list[str]],
+                          file_sizes: dict[str, int]) -> None:
         # Print found duplicates in grouped format
         if not duplicates:
             print("No duplicates found.")
@@ -265,7 +696,7 @@ class DuplicateFinder:
 
         print("\nDuplicate files:")
         for idx, group in enumerate(duplicates, start=1):
-            size = Path(group[0]).stat().st_size
+            size = file_sizes[group[0]]
             print(
                 f"\nGroup {idx}/{total_groups} ({len(group)}"
                 f" file(s), size: {utils.int_file_size_to_str(size)}):"
@@ -275,21 +706,27 @@ class DuplicateFinder:
 
     @staticmethod
     def _save_report_to_file(duplicates: list[list[str]],
-                             output_report_path: str
+                             output_report_path: str,
+                             file_sizes: dict[str, int]
                              ) -> None:
-        # Save duplicate report to a specified file
+        # Save duplicate report to a specified file. Lines are generated
+        # lazily into a large write buffer, so big reports are flushed
+        # to the file in few system calls
         total_groups = len(duplicates)
+
+        def report_lines() -> Iterator[str]:
+            yield "Duplicate files:\n"
+            for idx, group in enumerate(duplicates, 1):
+                size = file_sizes[group[0]]
+                yield (f"\nGroup {idx}/{total_groups} ({len(group)}"
+                       f" file(s), size: {size} bytes):\n")
+                for path in group:
+                    yield f"  - {path}\n"
+
         try:
-            with open(output_report_path, "w", encoding="utf-8") as f:
-                f.write("Duplicate files:\n")
-                for idx, group in enumerate(duplicates, 1):
-                    size = Path(group[0]).stat().st_size
-                    f.write(
-                        f"\nGroup {idx}/{total_groups} ({len(group)}"
-                        f" file(s), size: {size} bytes):\n"
-                    )
-                    for path in group:
-                        f.write(f"  - {path}\n")
+            with open(output_report_path, "w", encoding="utf-8",
+                      buffering=_REPORT_BUFFER_SIZE) as f:
+                f.writelines(report_lines())
             print(f"\nSaved results to: {output_report_path}")
         except Exception as e:
             print(f"\nERROR: Failed to save to file {output_report_path}: {e}")
@@ -297,7 +734,8 @@ class DuplicateFinder:
     @staticmethod
     def _delete_duplicates(duplicates: list[list[str]],
                            dry_run: bool = False,
-                           report_path: str | None = None
+                           report_path: str | None = None,
+                           file_sizes: dict[str, int] | None = None
                            ) -> None:
         # Delete all duplicates (keeping first file
         # in each group), optionally save report
@@ -308,7 +746,8 @@ class DuplicateFinder:
         for group in duplicates:
             for path in group[1:]:  # Keep just a first file in each group
                 try:
-                    file_size = Path(path).stat().st_size
+                    file_size = DuplicateFinder._get_file_size(
+                        path, file_sizes)
                 except Exception as e:
                     print(f"ERROR: Could not get size for {path}: {e}")
                     report_lines.append(f"FAILED: {path} ({e})")
@@ -319,7 +758,7 @@ class DuplicateFinder:
                     report_lines.append(f"[would delete] {path}")
                 else:
                     try:
-                        Path(path).unlink()
+                        os.unlink(path)
                         print(f"Deleted: {path}")
                         report_lines.append(f"Deleted: {path}")
                     except Exception as e:
@@ -341,19 +780,17 @@ class DuplicateFinder:
 
         # Write deletion report if requested
         if report_path:
-            try:
-                with open(report_path, "w", encoding="utf-8") as f:
-                    f.write("Duplicate File Deletion"
-                            " Report\n" + "=" * 36 + "\n")
-                    f.writelines(line + "\n" for line in report_lines)
-                print(f"Report saved to: {report_path}")
-            except Exception as e:
-                print(f"ERROR: Failed to save report: {e}")
+            DuplicateFinder._save_deletion_report(
+                report_path,
+                "Duplicate File Deletion Report\n" + "=" * 36,
+                report_lines)
 
     @staticmethod
-    def _delete_duplicates_interactive(duplicates: list[list[str]],
-                                       report_path: str | None = None
-                                       ) -> None:
+    def _delete_duplicates_interactive(
+            duplicates: list[list[str]],
+            report_path: str | None = None,
+            file_sizes: dict[str, int] | None = None
+    ) -> None:
         # Prompt user to choose which file to keep in each group
         print("\nInteractive duplicate cleanup started.")
         deleted_count = 0
@@ -393,13 +830,14 @@ class DuplicateFinder:
             for path in to_delete:
                 try:
                     try:
-                        file_size = Path(path).stat().st_size
+                        file_size = DuplicateFinder._get_file_size(
+                            path, file_sizes)
                     except Exception as e:
                         print(f"ERROR: Could not get size for {path}: {e}")
                         report_lines.append(f"FAILED: {path} ({e})")
                         continue
 
-                    Path(path).unlink()
+                    os.unlink(path)
                     print(f"Deleted: {path}")
 
                     report_lines.append(f"Deleted: {path}")
@@ -416,48 +854,83 @@ class DuplicateFinder:
         )
 
         if report_path:
-            try:
-                with open(report_path, "w", encoding="utf-8") as f:
-                    f.write("Interactive Deletion Report\n" + "=" * 32 + "\n")
-                    f.writelines(line + "\n" for line in report_lines)
-                print(f"Report saved to: {report_path}")
-            except Exception as e:
-                print(f"ERROR: Failed to save report: {e}")
+            DuplicateFinder._save_deletion_report(
+                report_path,
+                "Interactive Deletion Report\n" + "=" * 32,
+                report_lines)
+
+    @staticmethod
+    def _get_file_size(path: str,
+                       file_sizes: dict[str, int] | None = None) -> int:
+        # Size captured during the scan, stat() only for unknown files
+        if file_sizes and path in file_sizes:
+            return file_sizes[path]
+        return os.stat(path).st_size
+
+    @staticmethod
+    def _save_deletion_report(report_path: str,
+                              header: str,
+                              report_lines: list[str]
+                              ) -> None:
+        # Save the deletion log shared by automatic and interactive modes
+        try:
+            with open(report_path, "w", encoding="utf-8",
+                      buffering=_REPORT_BUFFER_SIZE) as f:
+                f.write("\n".join([header, *report_lines]) + "\n")
+            print(f"Report saved to: {report_path}")
+        except Exception as e:
+            print(f"ERROR: Failed to save report: {e}")
 
     @staticmethod
-    def _verify_content(file_groups: dict[str, list[str]]
-                        ) -> dict[str, list[str]]:
-        verified = defaultdict(list)
-        total_comparisons = sum(
-            len(group) * (len(group) - 1) // 2
-            for group in file_groups.values()
+    def _verify_content(file_groups: dict[bytes, list[str]],
+                        max_workers: int = 8
+                        ) -> dict[bytes, list[str]]:
+        groups = {
+            file_hash: group for file_hash, group in file_groups.items()
             if len(group) > 1
-        )
+        }
 
         print("Verifying content of potential duplicates...")
 
-        completed = 0
-        for file_hash, group in file_groups.items():
-            if len(group) < 2:
-                continue
-            while group:
-                ref = group.pop(0)
-                verified[file_hash].append(ref)
-                remaining = []
-                for other in group:
-                    try:
-                        if utils.files_are_identical(ref, other):
-                            verified[file_hash].append(other)
-                        else:
-                            remaining.append(other)
-                    except Exception as e:
-                        print(f"\nERROR: Failed to compare {ref}"
-                              f" and {other}: {e}")
-                        remaining.append(other)
-                    completed += 1
-                    print(f"\r[Verification]"
-                          f" Progress [{completed}/{total_comparisons}]",
-                          end="")
-                group = remaining
-        print()
+        # Groups are independent, so they are compared in parallel.
+        # Comparison happens on bytes and mmap slices, which release the
+        # GIL while reading and compare memory in C
+        verified: dict[bytes, list[str]] = {}
+        progress = Progress("Verification", len(groups))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_hash = {
+                executor.submit(
+                    DuplicateFinder._split_identical, group): file_hash
+                for file_hash, group in groups.items()
+            }
+            for i, future in enumerate(as_completed(future_to_hash), 1):
+                progress.tick(i)
+                file_hash = future_to_hash[future]
+                # Files that differ despite the equal hash get keys of
+                # their own, so they are not reported as duplicates
+                for n, group in enumerate(future.result()):
+                    key = file_hash if n == 0 else b"%s#%d" % (file_hash, n)
+                    verified[key] = group
+        progress.finish()
         return verified
+
+    @staticmethod
+    def _split_identical(group: list[str]) -> list[list[str]]:
+        # Split a group into lists of files with identical content
+        subgroups = []
+        while group:
+            ref, *others = group
+            identical = [ref]
+            group = []
+            for other in others:
+                try:
+                    if utils.files_are_identical(ref, other):
+                        identical.append(other)
+                    else:
+                        group.append(other)
+                except Exception as e:
+                    print(f"\nERROR: Failed to compare {ref}"
+                          f" and {other}: {e}")
+                    group.append(other)
+            subgroups.append(identical)
+        return subgroups
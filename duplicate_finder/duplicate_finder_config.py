@@ -8,7 +8,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional
 
-from duplicate_finder.utils import str_file_size_to_int
+from duplicate_finder.utils import (READ_BLOCK_SIZE, SAMPLE_SIZE,
+                                    resolve_hash_algorithm,
+                                    str_file_size_to_int)
 
 
 @dataclass
@@ -76,10 +78,46 @@ class DuplicateFinderConfig:
     # If None, the default number of threads will be used.
     threads_count: int = 0
 
+    # Flag to hash files in worker processes instead of threads.
+    # If True, hashing is not limited by the GIL, which helps on
+    # many-core machines with fast storage.
+    use_processes: bool = False
+
+    # Number of bytes read from the start and from the end of every
+    # candidate file to split same-size groups before full hashing.
+    # Files not larger than twice this size are never hashed in full.
+    # If 0 or less, the default of 4 KiB is used.
+    prefilter_bytes: int = SAMPLE_SIZE
+
+    # Size of the blocks files are read in while hashing, in bytes.
+    # Larger blocks mean fewer read calls per file.
+    # If 0 or less, the default of 1 MiB is used.
+    read_block_size: int = READ_BLOCK_SIZE
+
     # Flag to byte-by-byte verify the content of files.
     # If True, files will be verified by comparing their content.
     verify_content: bool = False
 
+    # Flag to use a fast non-cryptographic fingerprint (XXH3-128 if the
+    # optional xxhash package is installed) instead of SHA256.
+    # If True, matching files are always verified byte by byte.
+    fast_hash: bool = False
+
+    # Hash algorithm used to group files by content: 'auto', 'sha256',
+    # 'blake2b', 'blake3' (optional blake3 package) or 'xxh3_128'
+    # (optional xxhash package).
+    # 'auto' uses BLAKE3 if installed and SHA256 otherwise, or with
+    # fast_hash XXH3-128 if installed and BLAKE2b otherwise.
+    # 'xxh3_128' is not collision resistant, so its matches are always
+    # verified byte by byte.
+    hash_algo: str = "auto"
+
+    # Path to a SQLite database used to cache file hashes between runs.
+    # Files whose modification time and size did not change since they
+    # were hashed are not read again.
+    # If None, every candidate file is hashed on every run.
+    hash_cache_path: Optional[str] = None
+
     # Delete duplicate files (keep first file in group)
     # If True, duplicate files will be deleted, keeping only
     # the first file in each group.
@@ -121,6 +159,12 @@ class DuplicateFinderConfig:
             self.normalize_str_file_size(self.min_file_size_str))
         self.output_file_path = self.normalize_file_path(self.output_file_path)
         self.threads_count = self.normalize_threads_counter(self.threads_count)
+        self.hash_cache_path = self.normalize_file_path(self.hash_cache_path)
+        self.hash_algo = resolve_hash_algorithm(self.hash_algo, self.fast_hash)
+        self.prefilter_bytes = self.normalize_prefilter_bytes(
+            self.prefilter_bytes)
+        self.read_block_size = self.normalize_read_block_size(
+            self.read_block_size)
         self.delete_report_file_path = self.normalize_file_path(
             self.delete_report_file_path
         )
@@ -183,6 +227,24 @@ class DuplicateFinderConfig:
         except ValueError as e:
             raise ValueError(f"Invalid size format '{size}': {e}") from e
 
+    @staticmethod
+    def normalize_prefilter_bytes(prefilter_bytes: int | None) -> int:
+        """
+        Normalize the prefilter sample size to a positive number of bytes.
+        """
+        if prefilter_bytes is None or prefilter_bytes <= 0:
+            return SAMPLE_SIZE
+        return prefilter_bytes
+
+    @staticmethod
+    def normalize_read_block_size(read_block_size: int | None) -> int:
+        """
+        Normalize the hashing block size to a positive number of bytes.
+        """
+        if read_block_size is None or read_block_size <= 0:
+            return READ_BLOCK_SIZE
+        return read_block_size
+
     @staticmethod
     def normalize_threads_counter(threads: int) -> int:
         """
@@ -0,0 +1,135 @@
+# Copyright (c) 2025 Vitalii Shkibtan
+# Licensed under the MIT License.
+# See LICENSE file in the project root for full license text.
+
+import os
+import sqlite3
+import time
+from types import TracebackType
+
+# Files modified this short a time before they were hashed may change
+# again within the same timestamp tick on file systems with coarse
+# timestamps (2 s on FAT), without any change of their mtime
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+class HashCache:
+    """
+    Persistent cache of file digests, stored in a SQLite database.
+
+    Entries are keyed by the device and inode of a file and the hash
+    algorithm, so renamed and hardlinked files are found as well. An
+    entry is only used while the modification time and size of the
+    file are unchanged, so modified files are hashed again. Digests of
+    files modified just before they were hashed are not stored, as a
+    later change might not show in the mtime. All entries for the
+    algorithm are loaded at once, new digests are written in a single
+    transaction by save().
+
+    Without a db_path the entries are only kept in memory, for as long
+    as the cache object lives.
+    """
+
+    def __init__(self, db_path: str | None, algorithm: str) -> None:
+        self.algorithm = algorithm
+        self._entries: dict[tuple[int, int], tuple[int, int, bytes]] = {}
+        self._conn: sqlite3.Connection | None = None
+        if db_path is not None:
+            self._conn = sqlite3.connect(db_path)
+            # WAL lets several runs share the database without blocking
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                " dev INTEGER NOT NULL,"
+                " ino INTEGER NOT NULL,"
+                " algorithm TEXT NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " digest BLOB NOT NULL,"
+                " PRIMARY KEY (dev, ino, algorithm))")
+            self._entries.update(
+                ((dev, ino), (mtime_ns, size, digest))
+                for dev, ino, mtime_ns, size, digest in self._conn.execute(
+                    "SELECT dev, ino, mtime_ns, size, digest FROM hashes"
+                    " WHERE algorithm = ?", (algorithm,)))
+        # Files missed by get(), with the state they had at that time
+        self._missed: dict[str, tuple[int, int, int, int]] = {}
+        self._updates: list[tuple[int, int, str, int, int, bytes]] = []
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.close()
+
+    def get(self, path: str,
+            state: tuple[int, int, int, int] | None = None
+            ) -> bytes | None:
+        """
+        Return the cached digest of a file, or None if the file is not
+        cached or was modified since it was hashed.
+
+        state is the (device, inode, mtime_ns, size) of the file, if it
+        is already known with a real inode number. Otherwise the file is
+        stat'ed.
+        """
+        if state is None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+            state = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+        dev, ino, mtime_ns, size = state
+        # Files without an inode number cannot be told apart
+        if not ino:
+            return None
+        entry = self._entries.get((dev, ino))
+        if entry and entry[:2] == (mtime_ns, size):
+            return entry[2]
+        self._missed[path] = state
+        return None
+
+    def put(self, path: str, digest: bytes) -> None:
+        """
+        Remember the digest of a file previously missed by get().
+
+        The modification time and size seen by get() are stored, so a
+        file changed while it was hashed is hashed again next time.
+        Files modified within _RACY_WINDOW_NS before now are not stored.
+        """
+        state = self._missed.pop(path, None)
+        if state is None:
+            return
+        dev, ino, mtime_ns, size = state
+        if time.time_ns() - mtime_ns < _RACY_WINDOW_NS:
+            return
+        self._entries[(dev, ino)] = (mtime_ns, size, digest)
+        if self._conn is not None:
+            self._updates.append(
+                (dev, ino, self.algorithm, mtime_ns, size, digest))
+
+    def discard_misses(self) -> None:
+        """Forget the files missed by get() and not put() since."""
+        self._missed.clear()
+
+    def save(self) -> None:
+        """Write new digests to the database."""
+        if self._conn is None or not self._updates:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO hashes"
+                " (dev, ino, algorithm, mtime_ns, size, digest)"
+                " VALUES (?, ?, ?, ?, ?, ?)", self._updates)
+        self._updates.clear()
+
+    def close(self) -> None:
+        """Save new digests and close the database."""
+        try:
+            self.save()
+        finally:
+            if self._conn is not None:
+                self._conn.close()
@@ -0,0 +1,50 @@
+# Copyright (c) 2025 Vitalii Shkibtan
+# Licensed under the MIT License.
+# See LICENSE file in the project root for full license text.
+
+import sys
+import time
+
+
+class Progress:
+    """
+    Single-line progress indicator for long running stages.
+
+    Redrawing the line for every processed file costs a formatted
+    write (and a flush) per file, which dominates runs over many small
+    files. The line is redrawn at most once per interval seconds and
+    always when the total is reached.
+    """
+
+    def __init__(self,
+                 label: str,
+                 total: int | None = None,
+                 interval: float = 0.1) -> None:
+        self.label = label
+        self.total = total
+        self.interval = interval
+        self._count = 0
+        self._shown = -1
+        self._last_time = float("-inf")
+
+    def tick(self, count: int) -> None:
+        """Report that count items are processed so far."""
+        self._count = count
+        now = time.monotonic()
+        if count == self.total or now - self._last_time >= self.interval:
+            self._show(now)
+
+    def finish(self) -> None:
+        """Show the final state and end the progress line."""
+        if self._shown != self._count:
+            self._show(time.monotonic())
+        print()
+
+    def _show(self, now: float) -> None:
+        self._last_time = now
+        self._shown = self._count
+        done = (f"{self._count}" if self.total is None
+                else f"{self._count}/{self.total}")
+        # One write and one flush per redraw
+        sys.stdout.write(f"\r[{self.label}] Progress [{done}]")
+        sys.stdout.flush()
@@ -2,18 +2,384 @@
 # Licensed under the MIT License.
 # See LICENSE file in the project root for full license text.
 
+import fnmatch
 import hashlib
+import math
+import mmap
+import os
 import re
-from pathlib import Path
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import FileIO
+from typing import BinaryIO, Protocol
 
+try:
+    import blake3
+except ImportError:
+    blake3 = None  # type: ignore[assignment, unused-ignore]
 
-def calc_file_sha256(file_path: str, block_size: int = 65536) -> str:
-    """Compute SHA256 hash for a given file."""
-    sha256 = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(block_size), b""):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+try:
+    import xxhash
+except ImportError:
+    xxhash = None  # type: ignore[assignment, unused-ignore]
+
+# Length of the raw digests used to group files by content
+DIGEST_SIZE = 16
+
+# Algorithms accepted by calc_file_digest. 'auto' picks the fastest
+# cryptographic one available, 'xxh3_128' is not collision resistant
+HASH_ALGORITHMS = ("auto", "sha256", "blake2b", "blake3", "xxh3_128")
+
+# Files up to this size are hashed after a single read
+SMALL_FILE_SIZE = 1 << 16
+
+# Default size of the blocks files are read in for hashing
+READ_BLOCK_SIZE = 1 << 20
+
+# Files larger than this are hashed and compared through a memory map,
+# which saves copying every byte from the page cache
+MMAP_THRESHOLD = 128 << 10
+
+# Memory-mapped files are compared in slices of this size
+COMPARE_STRIDE = 1 << 20
+
+# Size of the head and tail blocks hashed by calc_file_sample_hash
+SAMPLE_SIZE = 4096
+
+# Files spanning more blocks than this are read ahead in the background
+PREFETCH_BLOCKS = 4
+
+# Leading part of a file the kernel is asked to prefetch before hashing
+WILLNEED_SIZE = 16 << 20
+
+# Human-readable file size format, e.g. '10MB', '2.5 GiB', '100K'
+_SIZE_RE = re.compile(r"\s*(\d+(?:\.\d*)?|\.\d+)\s*([KMGT]?I?B?)?\s*",
+                      re.IGNORECASE)
+
+# Multipliers of the decimal and binary size units
+_SIZE_UNITS = {
+    "": 1,
+    "B": 1,
+    "K": 10**3,
+    "KB": 10**3,
+    "M": 10**6,
+    "MB": 10**6,
+    "G": 10**9,
+    "GB": 10**9,
+    "T": 10**12,
+    "TB": 10**12,
+    "KI": 2**10,
+    "KIB": 2**10,
+    "MI": 2**20,
+    "MIB": 2**20,
+    "GI": 2**30,
+    "GIB": 2**30,
+    "TI": 2**40,
+    "TIB": 2**40,
+}
+
+# Units of human-readable sizes, each 1024 times the previous one
+_SIZE_UNIT_NAMES = ("B", "KB", "MB", "GB", "TB", "PB")
+
+
+class _Hasher(Protocol):
+    def update(self, data: bytes | memoryview | mmap.mmap, /) -> None: ...
+
+    def digest(self) -> bytes: ...
+
+
+def _read_blocks(f: FileIO, block_size: int) -> Iterator[memoryview]:
+    """
+    Yield blocks of a file read into a single reused buffer, so no
+    bytes object is allocated per block. A yielded view is only valid
+    until the next block is requested.
+    """
+    buffer = memoryview(bytearray(block_size))
+    while n := f.readinto(buffer):
+        yield buffer[:n]
+
+
+def _read_blocks_ahead(f: FileIO, block_size: int) -> Iterator[memoryview]:
+    """
+    Yield blocks of a file, reading the next block in a background
+    thread while the caller processes the current one. The two reused
+    buffers take turns, so a yielded view is only valid until the next
+    block is requested.
+    """
+    buffers = [memoryview(bytearray(block_size)) for _ in range(2)]
+    current = 0
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        pending = reader.submit(f.readinto, buffers[current])
+        while n := pending.result():
+            block = buffers[current][:n]
+            current ^= 1
+            pending = reader.submit(f.readinto, buffers[current])
+            yield block
+
+
+@contextmanager
+def _sequential_access(fd: int, size: int) -> Iterator[None]:
+    """
+    Advise the kernel that an open file is about to be read once from
+    start to end.
+
+    Sequential access doubles the readahead window and the start of the
+    file is prefetched right away. Once the file is processed its pages
+    are dropped from the page cache, so scanning a large tree does not
+    evict the rest of the system's working set. No-op where
+    posix_fadvise is not available.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        yield
+        return
+
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(fd, 0, min(size, WILLNEED_SIZE),
+                         os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    try:
+        yield
+    finally:
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def _update_from_mmap(hasher: _Hasher, f: BinaryIO) -> bool:
+    """
+    Feed a whole file to the hasher in one call through a memory map,
+    so the data goes from the page cache straight to the hash function
+    without a bytes object per block. Returns False if the file cannot
+    be mapped (e.g. special or remote file systems).
+    """
+    try:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            hasher.update(mm)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def _update_from_path(hasher: _Hasher, file_path: str,
+                      block_size: int) -> _Hasher:
+    """
+    Feed a whole file to the hasher, reading it the cheapest way for
+    its size: small files with a single unbuffered read, large files
+    through a memory map and the rest block by block with read-ahead.
+
+    Files short enough to be read without read-ahead go through
+    hashlib.file_digest where available (Python 3.11+), which reads
+    into a reused buffer in C. Returns the hasher.
+    """
+    with open(file_path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= SMALL_FILE_SIZE:
+            hasher.update(f.read())
+            return hasher
+        with _sequential_access(f.fileno(), size):
+            if size > MMAP_THRESHOLD and _update_from_mmap(hasher, f):
+                return hasher
+            if (size <= PREFETCH_BLOCKS * block_size
+                    and hasattr(hashlib, "file_digest")):
+                # file_digest only calls update() on the object, the
+                # stubs ask for a full hashlib object
+                hashlib.file_digest(
+                    f, lambda: hasher)  # type: ignore[arg-type, return-value]
+                return hasher
+            _update_from_file(hasher, f, size, block_size)
+    return hasher
+
+
+def _update_from_file(hasher: _Hasher, f: FileIO, size: int,
+                      block_size: int) -> None:
+    """
+    Feed a file to the hasher block by block.
+
+    Both reading and hashing release the GIL, so for files spanning
+    several blocks the disk is kept busy while the CPU hashes.
+    """
+    if size > PREFETCH_BLOCKS * block_size:
+        blocks = _read_blocks_ahead(f, block_size)
+    else:
+        blocks = _read_blocks(f, block_size)
+    for chunk in blocks:
+        hasher.update(chunk)
+
+
+def calc_file_sha256(file_path: str,
+                     block_size: int = READ_BLOCK_SIZE) -> str:
+    """
+    Compute SHA256 hash for a given file.
+    """
+    return _update_from_path(hashlib.sha256(), file_path,
+                             block_size).digest().hex()
+
+
+def _blake3_digest(file_path: str) -> bytes:
+    """
+    Compute the BLAKE3 digest of a file, truncated to DIGEST_SIZE bytes.
+
+    BLAKE3 is SIMD-accelerated, and large files are memory-mapped and
+    hashed on several threads.
+    """
+    if blake3 is None:
+        raise ValueError("Hash algorithm 'blake3' requires"
+                         " the optional blake3 package")
+    with open(file_path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= MMAP_THRESHOLD:
+            return bytes(blake3.blake3(f.read()).digest(DIGEST_SIZE))
+        with _sequential_access(f.fileno(), size):
+            hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+            hasher.update_mmap(file_path)
+    return bytes(hasher.digest(DIGEST_SIZE))
+
+
+def resolve_hash_algorithm(algorithm: str = "auto",
+                           fast_hash: bool = False) -> str:
+    """
+    Resolve a hash algorithm name to one of HASH_ALGORITHMS.
+
+    'auto' becomes BLAKE3 if the optional blake3 package is installed
+    and SHA256 otherwise, or with fast_hash XXH3-128 if the optional
+    xxhash package is installed and BLAKE2b otherwise. Raises ValueError
+    for unknown algorithms and algorithms whose package is missing.
+    """
+    algorithm = algorithm.strip().lower()
+    if algorithm == "auto":
+        if fast_hash:
+            return "xxh3_128" if xxhash is not None else "blake2b"
+        return "blake3" if blake3 is not None else "sha256"
+    if algorithm not in HASH_ALGORITHMS:
+        raise ValueError(f"Unsupported hash algorithm '{algorithm}'")
+    if algorithm == "blake3" and blake3 is None:
+        raise ValueError("Hash algorithm 'blake3' requires"
+                         " the optional blake3 package")
+    if algorithm == "xxh3_128" and xxhash is None:
+        raise ValueError("Hash algorithm 'xxh3_128' requires"
+                         " the optional xxhash package")
+    return algorithm
+
+
+def calc_file_digest(file_path: str,
+                     algorithm: str = "auto",
+                     block_size: int = READ_BLOCK_SIZE) -> bytes:
+    """
+    Compute the raw digest of a file with one of HASH_ALGORITHMS.
+
+    The digest is truncated to DIGEST_SIZE bytes: it is only compared
+    for equality, and short bytes keys are cheaper to store and look up
+    than hex strings. Digests of different algorithms never match.
+    """
+    if algorithm == "auto":
+        algorithm = resolve_hash_algorithm()
+    if algorithm == "sha256":
+        return _update_from_path(hashlib.sha256(), file_path,
+                                 block_size).digest()[:DIGEST_SIZE]
+    if algorithm == "blake3":
+        return _blake3_digest(file_path)
+
+    hasher: _Hasher
+    if algorithm == "blake2b":
+        hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    elif algorithm == "xxh3_128" and xxhash is not None:
+        hasher = xxhash.xxh3_128()
+    else:
+        # Not normalized yet: raises if unknown or not installed
+        return calc_file_digest(
+            file_path, resolve_hash_algorithm(algorithm), block_size)
+    return _update_from_path(hasher, file_path, block_size).digest()
+
+
+def calc_file_sample_hash(file_path: str,
+                          sample_size: int = SAMPLE_SIZE) -> bytes:
+    """
+    Compute a cheap hash of the first and last sample_size bytes of a file.
+
+    Files with different samples cannot be identical, so the sample is
+    used to split files of equal size before they are hashed in full.
+    Files not larger than two samples are hashed completely.
+    The file is read unbuffered, so exactly the sampled bytes are read.
+    """
+    blake2b = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= 2 * sample_size:
+            blake2b.update(f.read())
+        else:
+            blake2b.update(f.read(sample_size))
+            f.seek(size - sample_size)
+            blake2b.update(f.read(sample_size))
+    return blake2b.digest()
+
+
+def compile_patterns(patterns: list[str] | None) -> re.Pattern[str] | None:
+    """
+    Compile a list of glob patterns into a single regular expression
+    that matches a path if any of the patterns does.
+
+    Each pattern is translated with fnmatch.translate, so matching is
+    the same as calling fnmatch.fnmatch for every pattern, but a path is
+    checked in one pass and the patterns are not looked up again for
+    every file. Matching ignores case where the file system does.
+
+    Returns None for an empty or missing list.
+    """
+    if not patterns:
+        return None
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return re.compile(
+        "|".join(f"(?:{fnmatch.translate(p)})" for p in patterns), flags)
+
+
+def compile_matcher(
+        patterns: list[str] | None) -> Callable[[str], bool] | None:
+    """
+    Build a function that checks whether a path matches any of a list
+    of glob patterns.
+
+    Most patterns are simple: '*.log' only checks the end of a path and
+    '*/temp/*' only looks for a substring, as '*' also matches '/'.
+    Those are checked with str.endswith and the in operator, the other
+    patterns are combined by compile_patterns. Matching is the same as
+    calling fnmatch.fnmatch for every pattern.
+
+    Returns None for an empty or missing list.
+    """
+    if not patterns:
+        return None
+    fold = os.path.normcase("A") == "a"
+    suffixes: list[str] = []
+    substrings: list[str] = []
+    others: list[str] = []
+    for pattern in patterns:
+        literal = pattern[1:]
+        if not pattern.startswith("*") or "?" in literal or "[" in literal:
+            others.append(pattern)
+        elif "*" not in literal:
+            suffixes.append(literal.lower() if fold else literal)
+        elif literal.endswith("*") and "*" not in literal[:-1]:
+            substring = literal[:-1]
+            substrings.append(substring.lower() if fold else substring)
+        else:
+            others.append(pattern)
+    suffix_tuple = tuple(suffixes)
+    regex = compile_patterns(others)
+
+    def match(path: str) -> bool:
+        if fold:
+            path = path.lower()
+        return (path.endswith(suffix_tuple)
+                or any(s in path for s in substrings)
+                or (regex is not None and regex.match(path) is not None))
+
+    return match
 
 
 def str_file_size_to_int(size_str: str) -> int:
@@ -25,38 +391,15 @@ def str_file_size_to_int(size_str: str) -> int:
     TiB) units.
     Raises ValueError for invalid or unknown units.
     """
-    match = re.fullmatch(
-        r"\s*([\d.]+)\s*([KMGT]?I?B?)?\s*", size_str.strip(), re.IGNORECASE
-    )
+    match = _SIZE_RE.fullmatch(size_str.strip())
     if not match:
         raise ValueError(f"Invalid size string: {size_str}")
 
     number, unit = match.groups()
     unit = (unit or "").upper()
-    units = {
-        "B": 1,
-        "K": 10**3,
-        "KB": 10**3,
-        "M": 10**6,
-        "MB": 10**6,
-        "G": 10**9,
-        "GB": 10**9,
-        "T": 10**12,
-        "TB": 10**12,
-        "KI": 2**10,
-        "KIB": 2**10,
-        "MI": 2**20,
-        "MIB": 2**20,
-        "GI": 2**30,
-        "GIB": 2**30,
-        "TI": 2**40,
-        "TIB": 2**40,
-        "": 1,
-        None: 1,
-    }
-    if unit not in units:
+    if unit not in _SIZE_UNITS:
         raise ValueError(f"Unknown size unit: {unit}")
-    return int(float(number) * units[unit])
+    return int(float(number) * _SIZE_UNITS[unit])
 
 
 def int_file_size_to_str(size_bytes: int) -> str:
@@ -70,20 +413,50 @@ def int_file_size_to_str(size_bytes: int) -> str:
         str: Human-readable file size, or 'Invalid size' for invalid input.
     """
     if (size_bytes is None or
-            not isinstance(size_bytes, (int, float)) or size_bytes < 0):
+            not isinstance(size_bytes, (int, float)) or
+            not math.isfinite(size_bytes) or size_bytes < 0):
         return "Invalid size"
 
-    tmp_size_bytes = float(size_bytes)
+    # Every unit covers 10 more bits, so the unit is picked from the bit
+    # length of the size and a single division is made
+    index = min((int(size_bytes).bit_length() - 1) // 10,
+                len(_SIZE_UNIT_NAMES) - 1)
+    if index <= 0:
+        return f"{int(size_bytes)} B"
+    return f"{size_bytes / (1 << (10 * index)):.1f} {_SIZE_UNIT_NAMES[index]}"
+
+
+def _mapped_files_are_identical(f1: BinaryIO, f2: BinaryIO,
+                                start: int, size: int) -> bool:
+    """
+    Compare two open files of equal size from the start offset through
+    memory maps. Slices are compared with a single memcmp each and no
+    read() syscalls are made.
+    """
+    with mmap.mmap(f1.fileno(), 0, access=mmap.ACCESS_READ) as mm1, \
+            mmap.mmap(f2.fileno(), 0, access=mmap.ACCESS_READ) as mm2:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm1.madvise(mmap.MADV_SEQUENTIAL)
+            mm2.madvise(mmap.MADV_SEQUENTIAL)
+        for offset in range(start, size, COMPARE_STRIDE):
+            end = offset + COMPARE_STRIDE
+            if mm1[offset:end] != mm2[offset:end]:
+                return False
+    return True
 
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if tmp_size_bytes < 1024:
-            return (
-                f"{int(tmp_size_bytes)} {unit}"
-                if unit == "B"
-                else f"{tmp_size_bytes:.1f} {unit}"
-            )
-        tmp_size_bytes /= 1024
-    return f"{tmp_size_bytes:.1f} PB"
+
+def _read_files_are_identical(f1: BinaryIO, f2: BinaryIO,
+                              chunk_size: int) -> bool:
+    """
+    Compare the rest of two open files chunk by chunk.
+    """
+    while True:
+        b1 = f1.read(chunk_size)
+        b2 = f2.read(chunk_size)
+        if b1 != b2:
+            return False
+        if not b1:  # EOF
+            return True
 
 
 def files_are_identical(
@@ -91,26 +464,57 @@ def files_are_identical(
         file2: str,
         chunk_size: int = 65536) -> bool:
     """
-    Check if two files are identical by comparing their SHA256 hashes.
+    Check if two files are identical by comparing their content.
+
+    Hardlinks of the same file are identical without reading them. The
+    first and the last chunk are compared before anything else, as most
+    different files of equal size already differ there. Large
+    files are then compared through memory maps in 1 MiB strides.
 
     Args:
-        file1 (Path): First file path.
-        file2 (Path): Second file path.
+        file1 (str): First file path.
+        file2 (str): Second file path.
         chunk_size (int): Size of chunks to read from files for comparison.
 
     Returns:
         bool: True if files are identical, False otherwise.
     """
-    file1_path = Path(file1)
-    file2_path = Path(file2)
-    if file1_path.stat().st_size != file2_path.stat().st_size:
-        return False
+    with open(file1, "rb") as f1, open(file2, "rb") as f2:
+        st1 = os.fstat(f1.fileno())
+        st2 = os.fstat(f2.fileno())
+        size = st1.st_size
+        if size != st2.st_size:
+            return False
+
+        # Hardlinks of one file are identical without reading them.
+        # File systems without inode numbers (FAT on Windows) report 0
+        same_file = (st1.st_dev, st1.st_ino) == (st2.st_dev, st2.st_ino)
+        if st1.st_ino and same_file:
+            return True
 
-    with open(file1_path, "rb") as f1, open(file2_path, "rb") as f2:
-        while True:
-            b1 = f1.read(chunk_size)
-            b2 = f2.read(chunk_size)
-            if b1 != b2:
+        if f1.read(chunk_size) != f2.read(chunk_size):
+            return False
+
+        # Appended or truncated data shows up at the end of a file
+        if size > chunk_size:
+            tail = max(chunk_size, size - chunk_size)
+            f1.seek(tail)
+            f2.seek(tail)
+            if f1.read(chunk_size) != f2.read(chunk_size):
                 return False
-            if not b1:  # EOF
-                return True
+            f1.seek(chunk_size)
+            f2.seek(chunk_size)
+
+        if size <= SMALL_FILE_SIZE:
+            return _read_files_are_identical(f1, f2, chunk_size)
+
+        with _sequential_access(f1.fileno(), size), \
+                _sequential_access(f2.fileno(), size):
+            if size > MMAP_THRESHOLD:
+                try:
+                    return _mapped_files_are_identical(
+                        f1, f2, chunk_size, size)
+                except (OSError, ValueError):
+                    # Not mappable, fall back to buffered reading
+                    pass
+            return _read_files_are_identical(f1, f2, chunk_size)
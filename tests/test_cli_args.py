@@ -6,7 +6,11 @@
 import subprocess
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+
+import pytest
+
+from duplicate_finder.cli_args import ArgumentParserAdapter
 
 
 def create_file(path: Path, content: str = "data") -> str:
@@ -57,3 +61,58 @@ def test_exclude_via_cli(tmp_path: Path) -> None:
     result = run_cli(str(tmp_path), "--exclude", "*.log")
     assert result.returncode == 0
     assert "Duplicate files" not in result.stdout
+
+
+def parse_args(*args: str) -> Any:
+    return ArgumentParserAdapter().parser.parse_args(["folder", *args])
+
+
+def test_hashing_defaults() -> None:
+    args = parse_args()
+    assert args.threads is None
+    assert args.processes is False
+    assert args.prefilter_bytes is None
+    assert args.read_block_size is None
+    assert args.fast is False
+    assert args.hash_algo == "auto"
+    assert args.hash_cache is None
+
+
+@pytest.mark.parametrize("option", ["--threads", "--jobs", "-j"])
+def test_threads_option(option: str) -> None:
+    assert parse_args(option, "4").threads == 4
+
+
+@pytest.mark.parametrize("option", ["--processes", "-p"])
+def test_processes_option(option: str) -> None:
+    assert parse_args(option).processes is True
+
+
+@pytest.mark.parametrize("option", ["--prefilter-bytes", "-b"])
+def test_prefilter_bytes_option(option: str) -> None:
+    assert parse_args(option, "8192").prefilter_bytes == 8192
+
+
+def test_read_block_size_option() -> None:
+    args = parse_args("--read-block-size", "65536")
+    assert args.read_block_size == 65536
+
+
+@pytest.mark.parametrize("option", ["--fast", "-f"])
+def test_fast_option(option: str) -> None:
+    assert parse_args(option).fast is True
+
+
+@pytest.mark.parametrize("option", ["--hash-algo", "-a"])
+def test_hash_algo_option(option: str) -> None:
+    assert parse_args(option, "blake2b").hash_algo == "blake2b"
+
+
+def test_hash_algo_rejects_unknown_choice() -> None:
+    with pytest.raises(SystemExit):
+        parse_args("--hash-algo", "md5")
+
+
+@pytest.mark.parametrize("option", ["--hash-cache", "-c"])
+def test_hash_cache_option(option: str) -> None:
+    assert parse_args(option, "hashes.db").hash_cache == "hashes.db"
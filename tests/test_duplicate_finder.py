@@ -2,12 +2,19 @@
 # Licensed under the MIT License.
 # See LICENSE file in the project root for full license text.
 
+import os
+import threading
+import time
 from pathlib import Path
-from typing import List, Optional
-from unittest.mock import patch
+from typing import Any, List, Optional
+from unittest.mock import MagicMock, patch
 
+import pytest
+
+from duplicate_finder import utils
 from duplicate_finder.duplicate_finder import DuplicateFinder
 from duplicate_finder.duplicate_finder_config import DuplicateFinderConfig
+from duplicate_finder.hash_cache import HashCache
 
 
 def create_file(path: Path, content: bytes) -> Path:
@@ -15,6 +22,13 @@ def create_file(path: Path, content: bytes) -> Path:
     return path
 
 
+def age_files(*paths: Path | str) -> None:
+    # Files modified just before they are hashed are not cached
+    mtime = time.time() - 60
+    for path in paths:
+        os.utime(path, (mtime, mtime))
+
+
 def make_config(
     folder: Path,
     *,
@@ -26,7 +40,12 @@ def make_config(
     sort_by_group_size: bool = False,
     sort_by_file_size: bool = False,
     threads_count: int = 1,
+    use_processes: bool = False,
+    prefilter_bytes: int = 4096,
     verify_content: bool = False,
+    fast_hash: bool = False,
+    hash_algo: str = "auto",
+    hash_cache_path: Optional[str] = None,
     delete_duplicates: bool = False,
     delete_report_file_path: Optional[str] = None,
     interactive_mode: bool = False,
@@ -42,7 +61,12 @@ def make_config(
         sort_by_group_size=sort_by_group_size,
         sort_by_file_size=sort_by_file_size,
         threads_count=threads_count,
+        use_processes=use_processes,
+        prefilter_bytes=prefilter_bytes,
         verify_content=verify_content,
+        fast_hash=fast_hash,
+        hash_algo=hash_algo,
+        hash_cache_path=hash_cache_path,
         delete_duplicates=delete_duplicates,
         delete_report_file_path=delete_report_file_path,
         interactive_mode=interactive_mode,
@@ -87,6 +111,29 @@ def test_exclude_patterns(tmp_path: Path) -> None:
     assert not any("b.log" in str(f) for group in result for f in group)
 
 
+def test_size_filters(tmp_path: Path) -> None:
+    small = [create_file(tmp_path / f"s{i}.txt", b"s" * 10)
+             for i in range(2)]
+    medium = [create_file(tmp_path / f"m{i}.txt", b"m" * 2000)
+              for i in range(2)]
+    large = [create_file(tmp_path / f"l{i}.txt", b"l" * 5000)
+             for i in range(2)]
+
+    config = make_config(tmp_path, min_file_size_str="1KB",
+                         max_file_size_str="4KB")
+    result = DuplicateFinder().run(config)
+    assert result == [sorted(str(p) for p in medium)]
+
+    config = make_config(tmp_path, min_file_size_str="1KB")
+    result = DuplicateFinder().run(config)
+    assert sorted(result) == [sorted(str(p) for p in large),
+                              sorted(str(p) for p in medium)]
+
+    config = make_config(tmp_path, max_file_size_str="1KB")
+    result = DuplicateFinder().run(config)
+    assert result == [sorted(str(p) for p in small)]
+
+
 def test_delete_duplicates(tmp_path: Path) -> None:
     create_file(tmp_path / "a.txt", b"dup")
     create_file(tmp_path / "b.txt", b"dup")
@@ -102,6 +149,58 @@ def test_delete_duplicates(tmp_path: Path) -> None:
     assert remaining_files[0].read_bytes() == b"dup"
 
 
+def test_second_run_reuses_digests(tmp_path: Path) -> None:
+    content = b"cached" * 10000
+    file1 = create_file(tmp_path / "a.bin", content)
+    file2 = create_file(tmp_path / "b.bin", content)
+    age_files(file1, file2)
+
+    config = make_config(tmp_path)
+    finder = DuplicateFinder()
+    finder.run(config)
+    with patch("duplicate_finder.utils.calc_file_digest",
+               MagicMock()) as calc_digest:
+        result = finder.run(config)
+
+    assert result == [sorted([str(file1), str(file2)])]
+    calc_digest.assert_not_called()
+
+
+def test_rerun_from_another_thread(tmp_path: Path) -> None:
+    content = b"cached" * 10000
+    file1 = create_file(tmp_path / "a.bin", content)
+    file2 = create_file(tmp_path / "b.bin", content)
+
+    config = make_config(tmp_path)
+    finder = DuplicateFinder()
+    finder.run(config)
+    file3 = create_file(tmp_path / "c.bin", b"second" * 10000)
+    file4 = create_file(tmp_path / "d.bin", b"second" * 10000)
+
+    results: list[list[list[str]]] = []
+    thread = threading.Thread(target=lambda: results.append(
+        finder.run(config)))
+    thread.start()
+    thread.join()
+
+    assert sorted(results[0]) == [sorted([str(file1), str(file2)]),
+                                  sorted([str(file3), str(file4)])]
+
+
+def test_delete_uses_scanned_sizes(
+        tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    file1 = str(tmp_path / "a.txt")
+    file2 = str(tmp_path / "b.txt")
+
+    DuplicateFinder._delete_duplicates(
+        [[file1, file2]], dry_run=True,
+        file_sizes={file1: 2048, file2: 2048})
+
+    output = capsys.readouterr().out
+    assert f"[would delete] {file2}" in output
+    assert "(2.0 KB)" in output
+
+
 def test_verify_content_true(tmp_path: Path) -> None:
     create_file(tmp_path / "a.txt", b"abcd")
     create_file(tmp_path / "b.txt", b"abce")
@@ -111,3 +210,485 @@ def test_verify_content_true(tmp_path: Path) -> None:
     result = finder.run(config)
 
     assert all(len(group) == 1 for group in result)
+
+
+def test_verify_content_splits_groups(tmp_path: Path) -> None:
+    file1 = str(create_file(tmp_path / "a.txt", b"same"))
+    file2 = str(create_file(tmp_path / "b.txt", b"diff"))
+    file3 = str(create_file(tmp_path / "c.txt", b"same"))
+    file4 = str(create_file(tmp_path / "d.txt", b"diff"))
+
+    result = DuplicateFinder._verify_content(
+        {b"hash": [file1, file2, file3, file4]}, max_workers=2)
+
+    assert sorted(result.values()) == [[file1, file3], [file2, file4]]
+
+
+def test_parallel_hashing_preserves_groups(tmp_path: Path) -> None:
+    for i in range(64):
+        # Equal heads and tails, so every pair is told apart by hashing
+        content = b"0" * 5000 + i.to_bytes(2, "big") + b"0" * 5000
+        create_file(tmp_path / f"{i}a.bin", content)
+        create_file(tmp_path / f"{i}b.bin", content)
+
+    serial = DuplicateFinder().run(make_config(tmp_path, threads_count=1))
+    # Small files would be hashed by a single worker otherwise
+    with patch("duplicate_finder.duplicate_finder._HASH_BYTES_PER_WORKER",
+               1):
+        parallel = DuplicateFinder().run(
+            make_config(tmp_path, threads_count=8))
+
+    assert len(serial) == 64
+    assert sorted(parallel) == sorted(serial)
+
+
+def test_nested_directories(tmp_path: Path) -> None:
+    (tmp_path / "one" / "two").mkdir(parents=True)
+    (tmp_path / "three").mkdir()
+    file1 = create_file(tmp_path / "one" / "two" / "a.txt", b"nested")
+    file2 = create_file(tmp_path / "three" / "b.txt", b"nested")
+    create_file(tmp_path / "c.txt", b"single")
+
+    config = make_config(tmp_path, threads_count=4)
+    finder = DuplicateFinder()
+    result = finder.run(config)
+
+    assert result == [sorted([str(file1), str(file2)])]
+
+
+def test_candidates_are_reported_during_scan(tmp_path: Path) -> None:
+    file1 = create_file(tmp_path / "a.txt", b"same")
+    file2 = create_file(tmp_path / "b.txt", b"same")
+    file3 = create_file(tmp_path / "c.txt", b"same")
+    create_file(tmp_path / "d.txt", b"single")
+
+    candidates: list[str] = []
+    DuplicateFinder._get_files_list(
+        str(tmp_path),
+        on_candidates=lambda size, paths: candidates.extend(paths))
+
+    assert sorted(candidates) == sorted(
+        [str(file1), str(file2), str(file3)])
+
+
+def test_different_samples_are_not_hashed(tmp_path: Path) -> None:
+    create_file(tmp_path / "a.bin", b"a" + b"0" * 20000)
+    create_file(tmp_path / "b.bin", b"b" + b"0" * 20000)
+
+    config = make_config(tmp_path)
+    finder = DuplicateFinder()
+    with patch("duplicate_finder.utils.calc_file_digest",
+               MagicMock()) as calc_digest:
+        result = finder.run(config)
+
+    assert result == []
+    calc_digest.assert_not_called()
+
+
+def test_only_sample_survivors_are_hashed(tmp_path: Path) -> None:
+    file1 = create_file(tmp_path / "a.bin", b"a" + b"0" * 20000)
+    file2 = create_file(tmp_path / "b.bin", b"a" + b"0" * 20000)
+    create_file(tmp_path / "c.bin", b"c" + b"0" * 20000)
+    create_file(tmp_path / "d.bin", b"d" + b"0" * 20000)
+
+    config = make_config(tmp_path)
+    finder = DuplicateFinder()
+    with patch("duplicate_finder.utils.calc_file_digest",
+               wraps=utils.calc_file_digest) as calc_digest:
+        result = finder.run(config)
+
+    assert result == [sorted([str(file1), str(file2)])]
+    hashed = sorted(call.args[0] for call in calc_digest.call_args_list)
+    assert hashed == sorted([str(file1), str(file2)])
+
+
+def test_many_small_duplicates(tmp_path: Path) -> None:
+    for i in range(1000):
+        create_file(tmp_path / f"{i}.txt", b"s" * 100)
+    create_file(tmp_path / "other.txt", b"o" * 100)
+
+    config = make_config(tmp_path)
+    finder = DuplicateFinder()
+    with patch("duplicate_finder.utils.calc_file_digest",
+               MagicMock()) as calc_digest:
+        result = finder.run(config)
+
+    assert [len(group) for group in result] == [1000]
+    assert str(tmp_path / "other.txt") not in result[0]
+    calc_digest.assert_not_called()
+
+
+def test_unique_sizes_are_not_read(tmp_path: Path) -> None:
+    for size in range(100, 110):
+        create_file(tmp_path / f"{size}.bin", b"x" * size)
+
+    config = make_config(tmp_path)
+    finder = DuplicateFinder()
+    with (patch("duplicate_finder.utils.calc_file_sample_hash",
+                MagicMock()) as calc_sample,
+          patch("duplicate_finder.utils.calc_file_digest",
+                MagicMock()) as calc_digest):
+        result = finder.run(config)
+
+    assert result == []
+    calc_sample.assert_not_called()
+    calc_digest.assert_not_called()
+
+
+def test_fast_hash(tmp_path: Path) -> None:
+    file1 = create_file(tmp_path / "a.txt", b"duplicate content" * 1000)
+    file2 = create_file(tmp_path / "b.txt", b"duplicate content" * 1000)
+    create_file(tmp_path / "c.txt", b"different content" * 1000)
+
+    config = make_config(tmp_path, fast_hash=True)
+    finder = DuplicateFinder()
+    result = finder.run(config)
+
+    assert result == [sorted([str(file1), str(file2)])]
+
+
+def test_process_pool_hashing(tmp_path: Path) -> None:
+    file1 = create_file(tmp_path / "a.txt", b"duplicate content" * 1000)
+    file2 = create_file(tmp_path / "b.txt", b"duplicate content" * 1000)
+
+    config = make_config(tmp_path, threads_count=2, use_processes=True)
+    finder = DuplicateFinder()
+    result = finder.run(config)
+
+    assert result == [sorted([str(file1), str(file2)])]
+
+
+def test_deletion_report_is_created(tmp_path: Path) -> None:
+    scan_dir = tmp_path / "scan"
+    scan_dir.mkdir()
+    create_file(scan_dir / "a.txt", b"dup")
+    duplicate = create_file(scan_dir / "b.txt", b"dup")
+    report = tmp_path / "deleted.txt"
+
+    config = make_config(scan_dir, delete_duplicates=True, dry_run=True,
+                         delete_report_file_path=str(report))
+    finder = DuplicateFinder()
+    finder.run(config)
+
+    lines = report.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "Duplicate File Deletion Report"
+    assert lines[2] == f"[would delete] {duplicate}"
+
+
+def test_small_files_are_not_hashed(tmp_path: Path) -> None:
+    empty1 = create_file(tmp_path / "empty1.txt", b"")
+    empty2 = create_file(tmp_path / "empty2.txt", b"")
+    tiny1 = create_file(tmp_path / "tiny1.txt", b"tiny")
+    tiny2 = create_file(tmp_path / "tiny2.txt", b"tiny")
+    create_file(tmp_path / "tiny3.txt", b"tint")
+
+    config = make_config(tmp_path)
+    finder = DuplicateFinder()
+    with patch("duplicate_finder.utils.calc_file_digest",
+               MagicMock()) as calc_digest:
+        result = finder.run(config)
+
+    assert sorted(result) == [
+        sorted([str(empty1), str(empty2)]),
+        sorted([str(tiny1), str(tiny2)]),
+    ]
+    calc_digest.assert_not_called()
+
+
+def test_symlinks_are_ignored(tmp_path: Path) -> None:
+    target = create_file(tmp_path / "a.txt", b"linked content")
+    (tmp_path / "link.txt").symlink_to(target)
+    (tmp_path / "linked_dir").symlink_to(tmp_path, target_is_directory=True)
+
+    config = make_config(tmp_path)
+    finder = DuplicateFinder()
+    result = finder.run(config)
+
+    assert result == []
+
+
+def test_scan_uses_directory_entries_only(tmp_path: Path) -> None:
+    file1 = create_file(tmp_path / "a.txt", b"abc")
+    (tmp_path / "sub").mkdir()
+
+    with (patch("os.stat", side_effect=AssertionError("os.stat")),
+          patch.object(Path, "stat", side_effect=AssertionError("stat"))):
+        subdirs, entries, errors = DuplicateFinder._scan_directory(
+            str(tmp_path))
+
+    sub_stat = (tmp_path / "sub").stat()
+    assert subdirs == [(str(tmp_path / "sub"),
+                        (sub_stat.st_dev, sub_stat.st_ino))]
+    file_stat = file1.stat()
+    assert entries == [(str(file1), 3,
+                        (file_stat.st_dev, file_stat.st_ino,
+                         file_stat.st_mtime_ns))]
+    assert errors == []
+
+
+def test_directories_are_scanned_once(tmp_path: Path) -> None:
+    (tmp_path / "data").mkdir()
+    file1 = create_file(tmp_path / "data" / "a.txt", b"same")
+    file2 = create_file(tmp_path / "data" / "b.txt", b"same")
+    scan_directory = DuplicateFinder._scan_directory
+
+    def fake_scan(directory: str) -> Any:
+        subdirs, entries, errors = scan_directory(directory)
+        if directory == str(tmp_path):
+            # The same directory mounted a second time
+            subdirs = subdirs + [(str(tmp_path / "mnt"), subdirs[0][1])]
+        return subdirs, entries, errors
+
+    with patch.object(DuplicateFinder, "_scan_directory",
+                      side_effect=fake_scan) as scan:
+        files = DuplicateFinder._get_files_list(str(tmp_path))
+
+    assert scan.call_count == 2
+    assert sorted(files[4]) == sorted([str(file1), str(file2)])
+
+
+def test_paths_are_resolved_once(tmp_path: Path) -> None:
+    real_dir = tmp_path / "real"
+    real_dir.mkdir()
+    file1 = create_file(real_dir / "a.txt", b"same")
+    file2 = create_file(real_dir / "b.txt", b"same")
+    (tmp_path / "link").symlink_to(real_dir, target_is_directory=True)
+
+    config = make_config(tmp_path / "link")
+    result = DuplicateFinder().run(config)
+
+    assert result == [sorted([str(file1.resolve()), str(file2.resolve())])]
+
+
+def test_sampled_files_are_not_hashed(tmp_path: Path) -> None:
+    file1 = create_file(tmp_path / "a.bin", b"x" * 5000)
+    file2 = create_file(tmp_path / "b.bin", b"x" * 5000)
+    create_file(tmp_path / "c.bin", b"x" * 4999 + b"y")
+
+    config = make_config(tmp_path)
+    finder = DuplicateFinder()
+    with patch("duplicate_finder.utils.calc_file_digest",
+               MagicMock()) as calc_digest:
+        result = finder.run(config)
+
+    assert result == [sorted([str(file1), str(file2)])]
+    calc_digest.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "total_bytes, max_workers, expected",
+    [
+        (0, 8, 1),
+        (1 << 20, 8, 1),
+        (16 << 20, 8, 2),
+        (1 << 30, 8, 8),
+        (1 << 30, 1, 1),
+    ],
+)
+def test_hash_workers_count(total_bytes: int, max_workers: int,
+                            expected: int) -> None:
+    assert DuplicateFinder._get_hash_workers_count(
+        total_bytes, max_workers) == expected
+
+
+def test_hardlinks_are_hashed_once(tmp_path: Path) -> None:
+    content = b"linked" * 10000
+    file1 = create_file(tmp_path / "a.bin", content)
+    file2 = tmp_path / "b.bin"
+    os.link(file1, file2)
+    file3 = create_file(tmp_path / "c.bin", content)
+
+    config = make_config(tmp_path)
+    finder = DuplicateFinder()
+    with patch("duplicate_finder.utils.calc_file_digest",
+               wraps=utils.calc_file_digest) as calc_hash:
+        result = finder.run(config)
+
+    assert result == [sorted([str(file1), str(file2), str(file3)])]
+    assert calc_hash.call_count == 2
+
+
+def test_hardlinks_use_scanned_file_ids() -> None:
+    groups = [["/data/a", "/data/b", "/data/c"], ["/data/d", "/data/e"]]
+    file_ids = {"/data/a": (1, 10, 0), "/data/b": (1, 10, 0),
+                "/data/c": (1, 11, 0), "/data/d": (1, 12, 0),
+                "/data/e": (1, 12, 0)}
+
+    with patch("os.stat", side_effect=AssertionError("os.stat")):
+        files, links, linked = DuplicateFinder._collapse_hardlinks(
+            groups, file_ids)
+
+    assert files == ["/data/a", "/data/c"]
+    assert links == {"/data/a": ["/data/b"]}
+    assert list(linked.values()) == [["/data/d", "/data/e"]]
+
+
+def test_hardlinked_files_grouped_without_hashing(tmp_path: Path) -> None:
+    file1 = create_file(tmp_path / "a.bin", b"linked" * 10000)
+    file2 = tmp_path / "b.bin"
+    os.link(file1, file2)
+
+    config = make_config(tmp_path)
+    finder = DuplicateFinder()
+    with patch("duplicate_finder.utils.calc_file_digest",
+               MagicMock()) as calc_digest:
+        result = finder.run(config)
+
+    assert result == [sorted([str(file1), str(file2)])]
+    calc_digest.assert_not_called()
+
+
+def test_prefilter_bytes(tmp_path: Path) -> None:
+    create_file(tmp_path / "a.bin", b"0" * 30000 + b"a" + b"0" * 30000)
+    create_file(tmp_path / "b.bin", b"0" * 30000 + b"b" + b"0" * 30000)
+
+    config = make_config(tmp_path, prefilter_bytes=65536)
+    finder = DuplicateFinder()
+    with patch("duplicate_finder.utils.calc_file_digest",
+               MagicMock()) as calc_digest:
+        result = finder.run(config)
+
+    assert result == []
+    calc_digest.assert_not_called()
+
+
+def test_largest_files_are_hashed_first(tmp_path: Path) -> None:
+    small = [create_file(tmp_path / f"s{i}.bin", b"s" * 10000)
+             for i in range(2)]
+    large = [create_file(tmp_path / f"l{i}.bin", b"l" * 20000)
+             for i in range(2)]
+    file_sizes = {str(path): path.stat().st_size
+                  for path in small + large}
+
+    with patch("duplicate_finder.utils.calc_file_digest",
+               wraps=utils.calc_file_digest) as calc_hash:
+        DuplicateFinder._group_files_by_hash(
+            [[str(p) for p in small], [str(p) for p in large]],
+            max_workers=1,
+            file_sizes=file_sizes)
+
+    hashed = [call.args[0] for call in calc_hash.call_args_list]
+    assert sorted(hashed[:2]) == [str(p) for p in large]
+
+
+def test_cache_hits_without_scanned_inodes(tmp_path: Path) -> None:
+    content = b"cached" * 10000
+    files = [str(create_file(tmp_path / name, content))
+             for name in ("a.bin", "b.bin")]
+    age_files(*files)
+    file_sizes = {path: len(content) for path in files}
+    # Directory listings on Windows report every inode number as 0
+    file_ids = {path: (0, 0, os.stat(path).st_mtime_ns) for path in files}
+
+    with HashCache(None, "sha256") as cache:
+        DuplicateFinder._group_files_by_hash(
+            [files], algorithm="sha256", file_sizes=file_sizes,
+            file_ids=file_ids, cache=cache)
+        with patch("duplicate_finder.utils.calc_file_digest",
+                   MagicMock()) as calc_digest:
+            result = DuplicateFinder._group_files_by_hash(
+                [files], algorithm="sha256", file_sizes=file_sizes,
+                file_ids=file_ids, cache=cache)
+
+    assert [sorted(group) for group in result.values()] == [files]
+    calc_digest.assert_not_called()
+
+
+def test_hash_cache_skips_unchanged_files(tmp_path: Path) -> None:
+    scan_dir = tmp_path / "scan"
+    scan_dir.mkdir()
+    content = b"cached" * 10000
+    file1 = create_file(scan_dir / "a.bin", content)
+    file2 = create_file(scan_dir / "b.bin", content)
+    age_files(file1, file2)
+    cache_path = str(tmp_path / "hashes.db")
+
+    config = make_config(scan_dir, hash_cache_path=cache_path)
+    first = DuplicateFinder().run(config)
+    with patch("duplicate_finder.utils.calc_file_digest",
+               wraps=utils.calc_file_digest) as calc_hash:
+        second = DuplicateFinder().run(config)
+
+    assert first == second == [sorted([str(file1), str(file2)])]
+    calc_hash.assert_not_called()
+
+
+def test_large_files(tmp_path: Path) -> None:
+    content = bytes(range(256)) * (3 * utils.MMAP_THRESHOLD // 256)
+    file1 = create_file(tmp_path / "a.bin", content)
+    file2 = create_file(tmp_path / "b.bin", content)
+    middle = len(content) // 2
+    create_file(tmp_path / "c.bin",
+                content[:middle] + b"x" + content[middle + 1:])
+
+    config = make_config(tmp_path, threads_count=4)
+    finder = DuplicateFinder()
+    result = finder.run(config)
+
+    assert result == [sorted([str(file1), str(file2)])]
+
+
+def test_unreadable_file_skipped(tmp_path: Path) -> None:
+    file1 = create_file(tmp_path / "a.bin", b"x" * 10000)
+    file2 = create_file(tmp_path / "b.bin", b"x" * 10000)
+    file3 = create_file(tmp_path / "c.bin", b"x" * 10000)
+
+    def fake_hash(path: str, algorithm: str, block_size: int) -> bytes:
+        if path == str(file3):
+            raise PermissionError("denied")
+        return b"hash"
+
+    config = make_config(tmp_path)
+    finder = DuplicateFinder()
+    with patch("duplicate_finder.utils.calc_file_digest",
+               side_effect=fake_hash):
+        result = finder.run(config)
+
+    assert result == [sorted([str(file1), str(file2)])]
+
+
+def test_deletion_report_is_written_at_once(tmp_path: Path) -> None:
+    report = tmp_path / "deleted.txt"
+    lines = [f"/data/{i}.bin" for i in range(1000)]
+    opened: list[Any] = []
+    real_open = open
+
+    def tracking_open(*args: Any, **kwargs: Any) -> Any:
+        f = real_open(*args, **kwargs)
+        setattr(f, "write", MagicMock(wraps=f.write))
+        opened.append(f)
+        return f
+
+    with patch("builtins.open", side_effect=tracking_open):
+        DuplicateFinder._save_deletion_report(
+            str(report), "Deleted files:", lines)
+
+    assert report.read_text(encoding="utf-8").splitlines() == [
+        "Deleted files:", *lines]
+    assert len(opened) == 1
+    assert opened[0].write.call_count == 1
+
+
+def test_report_saving(tmp_path: Path) -> None:
+    scan_dir = tmp_path / "scan"
+    scan_dir.mkdir()
+    file1 = create_file(scan_dir / "a.bin", b"x" * 10000)
+    file2 = create_file(scan_dir / "b.bin", b"x" * 10000)
+    create_file(scan_dir / "c.bin", b"y" * 100)
+    create_file(scan_dir / "d.bin", b"y" * 100)
+    report = tmp_path / "report.txt"
+
+    config = make_config(scan_dir, output_file_path=str(report),
+                         sort_by_file_size=True)
+    finder = DuplicateFinder()
+    finder.run(config)
+
+    lines = report.read_text(encoding="utf-8").splitlines()
+    assert lines[:5] == [
+        "Duplicate files:",
+        "",
+        "Group 1/2 (2 file(s), size: 10000 bytes):",
+        f"  - {file1}",
+        f"  - {file2}",
+    ]
+    assert lines[6] == "Group 2/2 (2 file(s), size: 100 bytes):"
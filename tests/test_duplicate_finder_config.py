@@ -86,3 +86,42 @@ def test_normalize_threads_counter_custom(temp_dir: str) -> None:
     cfg = DuplicateFinderConfig(scan_folder_path=temp_dir,
                                 threads_count=4)
     assert cfg.threads_count == 4
+
+
+def test_normalize_hash_algo_valid(temp_dir: str) -> None:
+    cfg = DuplicateFinderConfig(scan_folder_path=temp_dir,
+                                hash_algo=" SHA256 ")
+    assert cfg.hash_algo == "sha256"
+
+
+def test_normalize_hash_algo_auto(temp_dir: str) -> None:
+    cfg = DuplicateFinderConfig(scan_folder_path=temp_dir)
+    assert cfg.hash_algo in ("sha256", "blake3")
+
+    cfg = DuplicateFinderConfig(scan_folder_path=temp_dir, fast_hash=True)
+    assert cfg.hash_algo in ("blake2b", "xxh3_128")
+
+
+def test_normalize_hash_algo_invalid(temp_dir: str) -> None:
+    with pytest.raises(ValueError):
+        DuplicateFinderConfig(scan_folder_path=temp_dir, hash_algo="md4")
+
+
+def test_normalize_prefilter_bytes(temp_dir: str) -> None:
+    cfg = DuplicateFinderConfig(scan_folder_path=temp_dir,
+                                prefilter_bytes=65536)
+    assert cfg.prefilter_bytes == 65536
+
+    cfg = DuplicateFinderConfig(scan_folder_path=temp_dir,
+                                prefilter_bytes=0)
+    assert cfg.prefilter_bytes > 0
+
+
+def test_normalize_read_block_size(temp_dir: str) -> None:
+    cfg = DuplicateFinderConfig(scan_folder_path=temp_dir,
+                                read_block_size=65536)
+    assert cfg.read_block_size == 65536
+
+    cfg = DuplicateFinderConfig(scan_folder_path=temp_dir,
+                                read_block_size=-1)
+    assert cfg.read_block_size == 1 << 20
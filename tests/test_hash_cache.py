@@ -0,0 +1,122 @@
+# Copyright (c) 2025 Vitalii Shkibtan
+# Licensed under the MIT License.
+# See LICENSE file in the project root for full license text.
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from duplicate_finder.hash_cache import HashCache
+
+
+def write_file(path: Path, content: bytes) -> Path:
+    # Files modified just before they are hashed are not cached
+    path.write_bytes(content)
+    mtime = time.time() - 60
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_cache_persists_digests(tmp_path: Path) -> None:
+    file_path = tmp_path / "a.bin"
+    write_file(file_path, b"data")
+    db_path = str(tmp_path / "hashes.db")
+
+    with HashCache(db_path, "sha256") as cache:
+        assert cache.get(str(file_path)) is None
+        cache.put(str(file_path), b"digest")
+
+    with HashCache(db_path, "sha256") as cache:
+        assert cache.get(str(file_path)) == b"digest"
+
+
+def test_cache_ignores_modified_files(tmp_path: Path) -> None:
+    file_path = tmp_path / "a.bin"
+    write_file(file_path, b"data")
+    db_path = str(tmp_path / "hashes.db")
+
+    with HashCache(db_path, "sha256") as cache:
+        cache.get(str(file_path))
+        cache.put(str(file_path), b"digest")
+
+    file_path.write_bytes(b"other data")
+    st = file_path.stat()
+    os.utime(file_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+
+    with HashCache(db_path, "sha256") as cache:
+        assert cache.get(str(file_path)) is None
+
+
+def test_cache_is_per_algorithm(tmp_path: Path) -> None:
+    file_path = tmp_path / "a.bin"
+    write_file(file_path, b"data")
+    db_path = str(tmp_path / "hashes.db")
+
+    with HashCache(db_path, "sha256") as cache:
+        cache.get(str(file_path))
+        cache.put(str(file_path), b"digest")
+
+    with HashCache(db_path, "xxh3_128") as cache:
+        assert cache.get(str(file_path)) is None
+
+
+def test_cache_follows_renamed_files(tmp_path: Path) -> None:
+    file_path = tmp_path / "a.bin"
+    write_file(file_path, b"data")
+    db_path = str(tmp_path / "hashes.db")
+
+    with HashCache(db_path, "sha256") as cache:
+        cache.get(str(file_path))
+        cache.put(str(file_path), b"digest")
+
+    renamed = file_path.rename(tmp_path / "b.bin")
+
+    with HashCache(db_path, "sha256") as cache:
+        assert cache.get(str(renamed)) == b"digest"
+
+
+def test_cache_without_database(tmp_path: Path) -> None:
+    file_path = tmp_path / "a.bin"
+    write_file(file_path, b"data")
+
+    with HashCache(None, "sha256") as cache:
+        assert cache.get(str(file_path)) is None
+        cache.put(str(file_path), b"digest")
+        assert cache.get(str(file_path)) == b"digest"
+
+    assert list(tmp_path.iterdir()) == [file_path]
+
+
+def test_cache_uses_known_state(tmp_path: Path) -> None:
+    file_path = tmp_path / "a.bin"
+    write_file(file_path, b"data")
+    st = file_path.stat()
+    state = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+    with HashCache(None, "sha256") as cache:
+        with patch("os.stat", side_effect=AssertionError("os.stat")):
+            assert cache.get(str(file_path), state) is None
+            cache.put(str(file_path), b"digest")
+            assert cache.get(str(file_path), state) == b"digest"
+
+
+def test_discarded_misses_are_not_stored(tmp_path: Path) -> None:
+    file_path = tmp_path / "a.bin"
+    write_file(file_path, b"data")
+
+    with HashCache(None, "sha256") as cache:
+        assert cache.get(str(file_path)) is None
+        cache.discard_misses()
+        cache.put(str(file_path), b"digest")
+        assert cache.get(str(file_path)) is None
+
+
+def test_cache_skips_recently_modified_files(tmp_path: Path) -> None:
+    file_path = tmp_path / "a.bin"
+    file_path.write_bytes(b"data")
+
+    with HashCache(None, "sha256") as cache:
+        assert cache.get(str(file_path)) is None
+        cache.put(str(file_path), b"digest")
+        assert cache.get(str(file_path)) is None
@@ -0,0 +1,38 @@
+# Copyright (c) 2025 Vitalii Shkibtan
+# Licensed under the MIT License.
+# See LICENSE file in the project root for full license text.
+
+import pytest
+
+from duplicate_finder.progress import Progress
+
+
+def test_progress_is_throttled(capsys: pytest.CaptureFixture[str]) -> None:
+    progress = Progress("Test", total=1000, interval=3600)
+    for i in range(1, 1001):
+        progress.tick(i)
+    progress.finish()
+
+    output = capsys.readouterr().out
+    assert output.count("\r") == 2
+    assert output.endswith("\r[Test] Progress [1000/1000]\n")
+
+
+def test_progress_without_total(capsys: pytest.CaptureFixture[str]) -> None:
+    progress = Progress("Test", interval=3600)
+    for i in range(1, 11):
+        progress.tick(i)
+    progress.finish()
+
+    output = capsys.readouterr().out
+    assert output == "\r[Test] Progress [1]\r[Test] Progress [10]\n"
+
+
+def test_progress_every_tick(capsys: pytest.CaptureFixture[str]) -> None:
+    progress = Progress("Test", total=3, interval=0)
+    for i in range(1, 4):
+        progress.tick(i)
+    progress.finish()
+
+    output = capsys.readouterr().out
+    assert output.count("\r") == 3
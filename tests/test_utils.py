@@ -2,8 +2,11 @@
 # Licensed under the MIT License.
 # See LICENSE file in the project root for full license text.
 
+import fnmatch
 import hashlib
+import os
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -41,6 +44,275 @@ def test_sha256_large_file(tmp_path: str) -> None:
                                   block_size=65536) == expected_hash
 
 
+@pytest.mark.skipif(not hasattr(hashlib, "file_digest"),
+                    reason="hashlib.file_digest requires Python 3.11+")
+def test_sha256_uses_file_digest(tmp_path: str) -> None:
+    content = b"hello world" * 10000
+    file_path = Path(tmp_path) / "test.txt"
+    file_path.write_bytes(content)
+
+    with patch.object(hashlib, "file_digest",
+                      wraps=hashlib.file_digest) as file_digest:
+        file_hash = utils.calc_file_sha256(str(file_path))
+
+    assert file_hash == hashlib.sha256(content).hexdigest()
+    file_digest.assert_called_once()
+
+
+@pytest.mark.skipif(not hasattr(hashlib, "file_digest"),
+                    reason="hashlib.file_digest requires Python 3.11+")
+def test_file_digest_keeps_passed_hasher(tmp_path: str) -> None:
+    content = b"hello world" * 10000
+    file_path = Path(tmp_path) / "test.txt"
+    file_path.write_bytes(content)
+    hasher = hashlib.blake2b(digest_size=utils.DIGEST_SIZE)
+
+    with patch.object(hashlib, "file_digest",
+                      wraps=hashlib.file_digest) as file_digest:
+        result = utils._update_from_path(hasher, str(file_path),
+                                         utils.READ_BLOCK_SIZE)
+
+    file_digest.assert_called_once()
+    assert result is hasher
+    assert hasher.digest() == hashlib.blake2b(
+        content, digest_size=utils.DIGEST_SIZE).digest()
+
+
+def test_sha256_default_block_size(tmp_path: str) -> None:
+    content = bytes(range(256)) * 20000
+    file_path = Path(tmp_path) / "blocks.bin"
+    file_path.write_bytes(content)
+
+    with (patch.object(utils, "_update_from_mmap", return_value=False),
+          patch.object(utils, "_update_from_file",
+                       wraps=utils._update_from_file) as update):
+        utils.calc_file_sha256(str(file_path))
+
+    assert update.call_args.args[3] == utils.READ_BLOCK_SIZE == 1 << 20
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"),
+                    reason="posix_fadvise is not available")
+def test_sha256_advises_sequential_access(tmp_path: str) -> None:
+    file_path = Path(tmp_path) / "test.txt"
+    file_path.write_bytes(b"hello world" * 10000)
+
+    with patch.object(os, "posix_fadvise") as fadvise:
+        utils.calc_file_sha256(str(file_path))
+
+    advices = [call.args[3] for call in fadvise.call_args_list]
+    assert advices == [os.POSIX_FADV_SEQUENTIAL,
+                       os.POSIX_FADV_WILLNEED,
+                       os.POSIX_FADV_DONTNEED]
+
+
+def test_sha256_read_ahead(tmp_path: str) -> None:
+    content = bytes(range(256)) * 1000
+    file_path = Path(tmp_path) / "blocks.bin"
+    file_path.write_bytes(content)
+
+    expected_hash = hashlib.sha256(content).hexdigest()
+
+    # Files that cannot be mapped are read in blocks
+    with patch.object(utils, "_update_from_mmap", return_value=False):
+        assert utils.calc_file_sha256(str(file_path),
+                                      block_size=1000) == expected_hash
+
+
+def test_sha256_small_file_single_read(tmp_path: str) -> None:
+    content = b"x" * utils.SMALL_FILE_SIZE
+    file_path = Path(tmp_path) / "small.bin"
+    file_path.write_bytes(content)
+
+    with patch.object(os, "posix_fadvise", create=True) as fadvise:
+        file_hash = utils.calc_file_sha256(str(file_path))
+
+    assert file_hash == hashlib.sha256(content).hexdigest()
+    fadvise.assert_not_called()
+
+
+def test_sha256_mmap_file(tmp_path: str) -> None:
+    content = b"0123456789abcdef" * (utils.MMAP_THRESHOLD // 16 + 1)
+    file_path = Path(tmp_path) / "huge.bin"
+    file_path.write_bytes(content)
+
+    expected_hash = hashlib.sha256(content).hexdigest()
+
+    assert utils.calc_file_sha256(str(file_path)) == expected_hash
+
+
+# calc_file_digest
+def test_file_digest_falls_back_to_sha256(tmp_path: str) -> None:
+    content = b"hello world"
+    file_path = Path(tmp_path) / "test.txt"
+    file_path.write_bytes(content)
+
+    with patch.object(utils, "blake3", None):
+        file_hash = utils.calc_file_digest(str(file_path))
+
+    assert file_hash == hashlib.sha256(content).digest()[:utils.DIGEST_SIZE]
+
+
+def test_file_digest_algorithms(tmp_path: str) -> None:
+    content = b"hello world" * 10000
+    file_path = Path(tmp_path) / "test.txt"
+    file_path.write_bytes(content)
+
+    sha256 = hashlib.sha256(content).digest()[:utils.DIGEST_SIZE]
+    blake2b = hashlib.blake2b(content, digest_size=utils.DIGEST_SIZE)
+
+    assert utils.calc_file_digest(str(file_path), "sha256") == sha256
+    assert (utils.calc_file_digest(str(file_path), "blake2b") ==
+            blake2b.digest())
+
+
+@pytest.mark.parametrize("size", [1000, utils.MMAP_THRESHOLD + 1])
+def test_file_digest_blake3(tmp_path: str, size: int) -> None:
+    blake3 = pytest.importorskip("blake3")
+    content = bytes(range(256)) * (size // 256 + 1)
+    file_path = Path(tmp_path) / "test.bin"
+    file_path.write_bytes(content)
+
+    expected = blake3.blake3(content).digest(utils.DIGEST_SIZE)
+
+    assert utils.calc_file_digest(str(file_path), "blake3") == expected
+
+
+@pytest.mark.parametrize("size", [1000, utils.MMAP_THRESHOLD + 1])
+def test_file_digest_xxh3(tmp_path: str, size: int) -> None:
+    xxhash = pytest.importorskip("xxhash")
+    content = bytes(range(256)) * (size // 256 + 1)
+    file_path = Path(tmp_path) / "test.bin"
+    file_path.write_bytes(content)
+
+    expected = xxhash.xxh3_128(content).digest()
+
+    assert utils.calc_file_digest(str(file_path), "xxh3_128") == expected
+
+
+def test_file_digest_missing_package(tmp_path: str) -> None:
+    file_path = Path(tmp_path) / "test.txt"
+    file_path.write_bytes(b"hello world")
+
+    with patch.object(utils, "xxhash", None):
+        with pytest.raises(ValueError):
+            utils.calc_file_digest(str(file_path), "xxh3_128")
+
+
+def test_file_digest_same_content(tmp_path: str) -> None:
+    file1 = Path(tmp_path) / "file1.bin"
+    file2 = Path(tmp_path) / "file2.bin"
+    file1.write_bytes(b"hello world")
+    file2.write_bytes(b"hello world")
+
+    assert (utils.calc_file_digest(str(file1), "blake2b") ==
+            utils.calc_file_digest(str(file2), "blake2b"))
+
+
+def test_file_digest_different_content(tmp_path: str) -> None:
+    file1 = Path(tmp_path) / "file1.bin"
+    file2 = Path(tmp_path) / "file2.bin"
+    file1.write_bytes(b"hello world")
+    file2.write_bytes(b"hello there")
+
+    assert (utils.calc_file_digest(str(file1), "blake2b") !=
+            utils.calc_file_digest(str(file2), "blake2b"))
+
+
+def test_file_digest_mmap_file(tmp_path: str) -> None:
+    content = b"0123456789abcdef" * (utils.MMAP_THRESHOLD // 16 + 1)
+    file1 = Path(tmp_path) / "file1.bin"
+    file2 = Path(tmp_path) / "file2.bin"
+    file1.write_bytes(content)
+    file2.write_bytes(content[:-1] + b"!")
+
+    expected = hashlib.blake2b(content, digest_size=16).digest()
+    assert utils.calc_file_digest(str(file1), "blake2b") == expected
+    assert utils.calc_file_digest(str(file2), "blake2b") != expected
+
+
+def test_file_digest_reused_buffer(tmp_path: str) -> None:
+    content = bytes(range(256)) * 800
+    file_path = Path(tmp_path) / "blocks.bin"
+    file_path.write_bytes(content)
+
+    with patch.object(utils, "_update_from_mmap", return_value=False):
+        digest = utils.calc_file_digest(str(file_path), "blake2b",
+                                        block_size=65536)
+
+    assert digest == hashlib.blake2b(content, digest_size=16).digest()
+
+
+# calc_file_sample_hash
+def test_sample_hash_ignores_middle(tmp_path: str) -> None:
+    file1 = Path(tmp_path) / "file1.bin"
+    file2 = Path(tmp_path) / "file2.bin"
+    file1.write_bytes(b"a" * 4096 + b"x" * 100 + b"b" * 4096)
+    file2.write_bytes(b"a" * 4096 + b"y" * 100 + b"b" * 4096)
+
+    assert (utils.calc_file_sample_hash(str(file1)) ==
+            utils.calc_file_sample_hash(str(file2)))
+
+
+def test_sample_hash_detects_tail(tmp_path: str) -> None:
+    file1 = Path(tmp_path) / "file1.bin"
+    file2 = Path(tmp_path) / "file2.bin"
+    file1.write_bytes(b"a" * 10000 + b"1")
+    file2.write_bytes(b"a" * 10000 + b"2")
+
+    assert (utils.calc_file_sample_hash(str(file1)) !=
+            utils.calc_file_sample_hash(str(file2)))
+
+
+# compile_patterns
+def test_compile_patterns_none() -> None:
+    assert utils.compile_patterns(None) is None
+    assert utils.compile_patterns([]) is None
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/data/app.log", True),
+        ("/data/temp/file.txt", True),
+        ("/data/.git/objects/ab", True),
+        ("/data/file.txt", False),
+        ("/data/app.log.txt", False),
+    ],
+)
+def test_compile_patterns_match(path: str, expected: bool) -> None:
+    pattern = utils.compile_patterns(["*.log", "*/temp/*", "**/.git/**"])
+    assert pattern is not None
+    assert bool(pattern.match(path)) is expected
+
+
+# compile_matcher
+def test_compile_matcher_none() -> None:
+    assert utils.compile_matcher(None) is None
+    assert utils.compile_matcher([]) is None
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/data/app.log",
+        "/data/temp/file.txt",
+        "/data/.git/objects/ab",
+        "/data/file.txt",
+        "/data/app.log.txt",
+        "/data/exclude.txt",
+        "/data/report-1.csv",
+    ],
+)
+def test_compile_matcher_same_as_fnmatch(path: str) -> None:
+    patterns = ["*.log", "*/temp/*", "**/.git/**", "*/exclude.txt",
+                "*-?.csv", "/data/file.*"]
+    match = utils.compile_matcher(patterns)
+    assert match is not None
+    assert match(path) is any(
+        fnmatch.fnmatch(path, pattern) for pattern in patterns)
+
+
 # str_file_size_to_int
 @pytest.mark.parametrize(
     "size_str, expected",
@@ -65,6 +337,7 @@ def test_sha256_large_file(tmp_path: str) -> None:
         ("123", 123),
         ("  2.5 MB ", int(2.5 * 1000**2)),
         ("10mb", 10 * 1000**2),
+        (".5KB", 500),
     ],
 )
 def test_str_file_size_to_int_valid(size_str: str, expected: int) -> None:
@@ -83,7 +356,7 @@ def test_str_file_size_to_int_valid(size_str: str, expected: int) -> None:
     ],
 )
 def test_str_file_size_to_int_invalid(invalid_str: str) -> None:
-    with pytest.raises(ValueError):
+    with pytest.raises(ValueError, match="Invalid size string"):
         utils.str_file_size_to_int(invalid_str)
 
 
@@ -102,6 +375,9 @@ def test_str_file_size_to_int_invalid(invalid_str: str) -> None:
         (1024**3, "1.0 GB"),
         (1024**4, "1.0 TB"),
         (1024**5, "1.0 PB"),
+        (1024**2 - 1, "1024.0 KB"),
+        (1023.5, "1023 B"),
+        (1024**6, "1024.0 PB"),
     ],
 )
 def test_int_file_size_to_str_valid(size_bytes: int, expected: str) -> None:
@@ -116,6 +392,8 @@ def test_int_file_size_to_str_valid(size_bytes: int, expected: str) -> None:
         "100",
         [1024],
         {"bytes": 1024},
+        float("inf"),
+        float("nan"),
     ],
 )
 def test_int_file_size_to_str_invalid(invalid_input: int) -> None:
@@ -173,3 +451,98 @@ def test_small_chunk_size(tmp_path: str) -> None:
         str(file2),
         chunk_size=10
     )
+
+
+def test_large_identical_files(tmp_path: str) -> None:
+    content = b"0123456789abcdef" * (utils.MMAP_THRESHOLD // 8)
+    file1 = create_temp_file(Path(tmp_path) / "file1.bin", content)
+    file2 = create_temp_file(Path(tmp_path) / "file2.bin", content)
+    assert utils.files_are_identical(
+        str(file1),
+        str(file2)
+    )
+
+
+def test_large_files_are_compared_mapped(tmp_path: str) -> None:
+    content = b"0123456789abcdef" * (utils.MMAP_THRESHOLD // 8)
+    file1 = create_temp_file(Path(tmp_path) / "file1.bin", content)
+    file2 = create_temp_file(Path(tmp_path) / "file2.bin", content)
+
+    with patch.object(utils, "_mapped_files_are_identical",
+                      wraps=utils._mapped_files_are_identical) as compare:
+        assert utils.files_are_identical(
+            str(file1),
+            str(file2)
+        )
+    compare.assert_called_once()
+
+
+def test_large_files_differ_at_end(tmp_path: str) -> None:
+    content = b"0123456789abcdef" * (utils.MMAP_THRESHOLD // 8)
+    file1 = create_temp_file(Path(tmp_path) / "file1.bin", content + b"1")
+    file2 = create_temp_file(Path(tmp_path) / "file2.bin", content + b"2")
+    assert not utils.files_are_identical(
+        str(file1),
+        str(file2)
+    )
+
+
+def test_large_files_differ_in_middle(tmp_path: str) -> None:
+    content = b"0123456789abcdef" * (utils.MMAP_THRESHOLD // 8)
+    middle = len(content) // 2
+    changed = content[:middle] + b"!" + content[middle + 1:]
+    file1 = create_temp_file(Path(tmp_path) / "file1.bin", content)
+    file2 = create_temp_file(Path(tmp_path) / "file2.bin", changed)
+    assert not utils.files_are_identical(
+        str(file1),
+        str(file2)
+    )
+
+
+def test_tail_is_compared_before_middle(tmp_path: str) -> None:
+    content = b"0123456789abcdef" * (utils.MMAP_THRESHOLD // 8)
+    file1 = create_temp_file(Path(tmp_path) / "file1.bin", content + b"1")
+    file2 = create_temp_file(Path(tmp_path) / "file2.bin", content + b"2")
+
+    with patch.object(utils, "_mapped_files_are_identical") as compare:
+        assert not utils.files_are_identical(
+            str(file1),
+            str(file2)
+        )
+    compare.assert_not_called()
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"),
+                    reason="posix_fadvise is not available")
+def test_compare_advises_sequential_access(tmp_path: str) -> None:
+    content = b"0123456789abcdef" * (utils.MMAP_THRESHOLD // 8)
+    file1 = create_temp_file(Path(tmp_path) / "file1.bin", content)
+    file2 = create_temp_file(Path(tmp_path) / "file2.bin", content)
+
+    with patch.object(os, "posix_fadvise") as fadvise:
+        assert utils.files_are_identical(
+            str(file1),
+            str(file2)
+        )
+
+    advices = sorted(call.args[3] for call in fadvise.call_args_list)
+    assert advices == sorted([os.POSIX_FADV_SEQUENTIAL,
+                              os.POSIX_FADV_WILLNEED,
+                              os.POSIX_FADV_DONTNEED] * 2)
+
+
+def test_hardlinks_are_identical_without_reading(tmp_path: str) -> None:
+    content = b"0123456789abcdef" * (utils.MMAP_THRESHOLD // 8)
+    file1 = create_temp_file(Path(tmp_path) / "file1.bin", content)
+    file2 = Path(tmp_path) / "file2.bin"
+    os.link(file1, file2)
+
+    with (patch("mmap.mmap") as mmap_mock,
+          patch.object(utils, "_read_files_are_identical") as compare):
+        assert utils.files_are_identical(
+            str(file1),
+            str(file2),
+            chunk_size=10
+        )
+    mmap_mock.assert_not_called()
+    compare.assert_not_called()